@@ -0,0 +1,245 @@
+"""
+    Thread safe and asyncio priority queues built on Heap.
+    Consumers block (or await) until a node is available instead of
+    polling is_empty(), and an optional capacity applies backpressure
+    to producers.
+"""
+import asyncio
+import collections
+import queue
+import threading
+
+from Heap import Heap
+
+
+class ConcurrentHeap:
+    """A thread safe Heap with blocking put and get."""
+    def __init__(self, values: list = (), maxsize: int = 0):
+        """Creates ConcurrentHeap.
+
+        Args:
+            values: The unordered values.
+            maxsize: The capacity, 0 means unbounded.
+
+        Running Time:
+            O(n)
+        """
+        self.heap = Heap(values)
+        self.maxsize = maxsize
+        lock = threading.Lock()
+        self._not_empty = threading.Condition(lock)
+        self._not_full = threading.Condition(lock)
+
+    def __len__(self):
+        with self._not_empty:
+            return len(self.heap.heap)
+
+    def _full(self):
+        return self.maxsize > 0 and len(self.heap.heap) >= self.maxsize
+
+    @staticmethod
+    def _wait(condition, predicate, timeout, error):
+        # waits until predicate() is true, raises error on timeout
+        if(timeout is None):
+            condition.wait_for(predicate)
+        elif(not condition.wait_for(predicate, timeout)):
+            raise error
+
+    def put(self, node, block = True, timeout = None):
+        """Inserts a node, waiting for room if the heap is full.
+
+        Args:
+            node: The node to be inserted.
+            block: Whether to wait for room.
+            timeout: The most seconds to wait, None waits forever.
+
+        Raises:
+            queue.Full: if there is no room in time.
+
+        Running Time:
+            O(log(n)) once there is room.
+        """
+        with self._not_full:
+            if(not block):
+                if(self._full()):
+                    raise queue.Full
+            else:
+                ConcurrentHeap._wait(self._not_full, lambda: not self._full(),
+                                     timeout, queue.Full)
+            self.heap.insert(node)
+            self._not_empty.notify()
+
+    def get(self, block = True, timeout = None):
+        """Removes and returns the node with minimum key, waiting for one
+        if the heap is empty.
+
+        Args:
+            block: Whether to wait for a node.
+            timeout: The most seconds to wait, None waits forever.
+
+        Raises:
+            queue.Empty: if there is no node in time.
+
+        Running Time:
+            O(log(n)) once there is a node.
+        """
+        with self._not_empty:
+            if(not block):
+                if(self.heap.is_empty()):
+                    raise queue.Empty
+            else:
+                ConcurrentHeap._wait(self._not_empty, lambda: not self.heap.is_empty(),
+                                     timeout, queue.Empty)
+            node = self.heap.extract_min()
+            self._not_full.notify()
+            return node
+
+    def get_many(self, k, timeout = None):
+        """Waits for at least one node, then removes and returns up to k
+        nodes with the smallest keys, in order, under a single lock.
+
+        Raises:
+            queue.Empty: if there is no node in time.
+
+        Running Time:
+            O(k*log(n))
+        """
+        with self._not_empty:
+            ConcurrentHeap._wait(self._not_empty, lambda: not self.heap.is_empty(),
+                                 timeout, queue.Empty)
+            nodes = self.heap.pop_many(k)
+            self._not_full.notify(len(nodes))
+            return nodes
+
+    def drain(self):
+        """Removes and returns every node, in order, without waiting.
+
+        Running Time:
+            O(n*log(n))
+        """
+        with self._not_empty:
+            nodes = self.heap.pop_many(len(self.heap.heap))
+            self._not_full.notify_all()
+            return nodes
+
+
+class AsyncHeap:
+    """A Heap for asyncio with awaitable put and get.
+
+    Waiting tasks park on futures and are woken one at a time, as in
+    asyncio.Queue. put_nowait and get_nowait need no running event loop,
+    so the heap can be filled before asyncio.run.
+    Not thread safe: use it from the tasks of one running event loop.
+    """
+    def __init__(self, values: list = (), maxsize: int = 0):
+        """Creates AsyncHeap.
+
+        Args:
+            values: The unordered values.
+            maxsize: The capacity, 0 means unbounded.
+
+        Running Time:
+            O(n)
+        """
+        self.heap = Heap(values)
+        self.maxsize = maxsize
+        # futures of the tasks waiting for a node / for room
+        self._getters = collections.deque()
+        self._putters = collections.deque()
+
+    def __len__(self):
+        return len(self.heap.heap)
+
+    def _full(self):
+        return self.maxsize > 0 and len(self.heap.heap) >= self.maxsize
+
+    @staticmethod
+    def _wakeup_next(waiters):
+        # wakes the first waiter that is still waiting
+        while(waiters):
+            waiter = waiters.popleft()
+            if(not waiter.done()):
+                waiter.set_result(None)
+                return
+
+    @staticmethod
+    async def _wait(waiters, blocked):
+        # parks on a future until blocked() is false
+        while(blocked()):
+            waiter = asyncio.get_running_loop().create_future()
+            waiters.append(waiter)
+            try:
+                await waiter
+            except:
+                waiter.cancel()
+                try:
+                    waiters.remove(waiter)
+                except ValueError:
+                    pass
+                # the wakeup this task got must go to another waiter
+                if(not blocked() and not waiter.cancelled()):
+                    AsyncHeap._wakeup_next(waiters)
+                raise
+
+    async def put(self, node):
+        """Inserts a node, waiting for room if the heap is full.
+
+        Wrap it in asyncio.wait_for to bound the wait.
+
+        Running Time:
+            O(log(n)) once there is room.
+        """
+        await AsyncHeap._wait(self._putters, self._full)
+        self.put_nowait(node)
+
+    def put_nowait(self, node):
+        """Inserts a node.
+
+        Raises:
+            asyncio.QueueFull: if the heap is full.
+
+        Running Time:
+            O(log(n))
+        """
+        if(self._full()):
+            raise asyncio.QueueFull
+        self.heap.insert(node)
+        AsyncHeap._wakeup_next(self._getters)
+
+    async def get(self):
+        """Removes and returns the node with minimum key, waiting for one
+        if the heap is empty.
+
+        Running Time:
+            O(log(n)) once there is a node.
+        """
+        await AsyncHeap._wait(self._getters, self.heap.is_empty)
+        return self.get_nowait()
+
+    def get_nowait(self):
+        """Removes and returns the node with minimum key.
+
+        Raises:
+            asyncio.QueueEmpty: if the heap is empty.
+
+        Running Time:
+            O(log(n))
+        """
+        if(self.heap.is_empty()):
+            raise asyncio.QueueEmpty
+        node = self.heap.extract_min()
+        AsyncHeap._wakeup_next(self._putters)
+        return node
+
+    async def get_many(self, k):
+        """Waits for at least one node, then removes and returns up to k
+        nodes with the smallest keys, in order.
+
+        Running Time:
+            O(k*log(n))
+        """
+        await AsyncHeap._wait(self._getters, self.heap.is_empty)
+        nodes = self.heap.pop_many(k)
+        for _ in nodes:
+            AsyncHeap._wakeup_next(self._putters)
+        return nodes
@@ -0,0 +1,204 @@
+"""
+    A k-way merge and an external sort driven by Heap.
+    The external sort cuts a text file that does not fit in memory into
+    sorted runs on disk, then merges the runs with a heap of k cursors,
+    so at most run_size lines are held in memory at a time.
+"""
+import collections
+import multiprocessing
+import os
+import tempfile
+
+from Heap import Heap, Node
+
+
+def merge(*iterables, key = None):
+    """Merges sorted iterables into one sorted stream.
+
+    Equal items come out in the order of the iterables they came from.
+
+    Args:
+        iterables: The sorted iterables.
+        key: Maps an item to its sort key, defaults to the item itself.
+
+    Running Time:
+        O(n*log(k)), k is the number of iterables.
+    """
+    nodes = []
+    for i, iterable in enumerate(iterables):
+        it = iter(iterable)
+        for item in it:
+            # the iterable index breaks ties, so items are never compared
+            nodes.append(Node((item, it), (item if key is None else key(item), i)))
+            break
+    heap = Heap(nodes)
+    while(not heap.is_empty()):
+        node = heap.min()
+        item, it = node.val
+        yield item
+        i = node.key[1]
+        for item in it:
+            heap.replace_min(Node((item, it), (item if key is None else key(item), i)))
+            break
+        else:
+            heap.extract_min()
+
+
+def _write_lines(path, lines, buffer_size):
+    with open(path, 'w', buffering = buffer_size) as f:
+        f.writelines(lines)
+
+
+def _sort_run(lines, key, tmp_dir, buffer_size):
+    """Sorts one run and writes it to a temp file, returns the file's path."""
+    lines.sort(key = key)
+    fd, path = tempfile.mkstemp(suffix = '.run', dir = tmp_dir)
+    os.close(fd)
+    try:
+        _write_lines(path, lines, buffer_size)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+def _lines(f):
+    # yields the lines of f, each ending with a newline
+    # (only the last line of a file can miss it)
+    for line in f:
+        if(not line.endswith('\n')):
+            line += '\n'
+        yield line
+
+
+def _read_runs(path, run_size, buffer_size):
+    # yields lists of at most run_size lines, each ending with a newline
+    with open(path, 'r', buffering = buffer_size) as f:
+        run = []
+        for line in _lines(f):
+            run.append(line)
+            if(len(run) >= run_size):
+                yield run
+                run = []
+        if(run):
+            yield run
+
+
+def merge_files(paths, output_path, key = None, buffer_size = 1 << 20, batch_size = 4096):
+    """Merges sorted text files line by line into output_path.
+
+    A missing newline at the end of an input file is added, so its
+    last line does not run into the next line of the output.
+
+    Args:
+        paths: The sorted input files.
+        output_path: The file to write.
+        key: Maps a line to its sort key, defaults to the line itself.
+        buffer_size: The buffer size of every open file, in bytes.
+        batch_size: The number of lines written per write call.
+
+    Running Time:
+        O(n*log(k)), k is the number of files.
+    """
+    files = [open(path, 'r', buffering = buffer_size) for path in paths]
+    try:
+        with open(output_path, 'w', buffering = buffer_size) as out:
+            batch = []
+            for line in merge(*[_lines(f) for f in files], key = key):
+                batch.append(line)
+                if(len(batch) >= batch_size):
+                    out.writelines(batch)
+                    batch = []
+            out.writelines(batch)
+    finally:
+        for f in files:
+            f.close()
+
+
+def external_sort(input_path, output_path, key = None, run_size = 1000000,
+                  fan_in = 64, buffer_size = 1 << 20, processes = 0, tmp_dir = None):
+    """Sorts the lines of a text file that may be bigger than memory.
+
+    Args:
+        input_path: The file to sort.
+        output_path: The file to write, it may be input_path.
+        key: Maps a line to its sort key, defaults to the line itself.
+            It must be picklable when processes is used.
+        run_size: The most lines sorted in memory at once.
+        fan_in: The most runs merged at once, more runs are merged in passes.
+        buffer_size: The buffer size of every open file, in bytes.
+        processes: The number of worker processes that sort runs,
+            0 sorts in this process.
+        tmp_dir: Where to write the runs, defaults to the system temp dir.
+
+    Running Time:
+        O(n*log(n)), with O(run_size) lines in memory
+        (O(run_size*processes) with workers).
+    """
+    if(fan_in < 2):
+        raise ValueError("fan_in must be at least 2")
+    # every temp file made so far, so a failure cannot leave any behind
+    temps = []
+    try:
+        runs = _make_runs(input_path, key, run_size, buffer_size, processes, tmp_dir, temps)
+        _merge_runs(runs, output_path, key, fan_in, buffer_size, tmp_dir, temps)
+    finally:
+        for path in temps:
+            if(os.path.exists(path)):
+                os.remove(path)
+
+
+def _make_runs(input_path, key, run_size, buffer_size, processes, tmp_dir, temps):
+    """Cuts input_path into sorted run files and returns their paths.
+
+    Every run file is added to temps as soon as it exists, also when
+    making a later run fails.
+    """
+    runs = []
+    if(processes > 0):
+        with multiprocessing.Pool(processes) as pool:
+            # keep only a few runs in flight, so memory stays bounded
+            pending = collections.deque()
+            try:
+                for run in _read_runs(input_path, run_size, buffer_size):
+                    pending.append(pool.apply_async(_sort_run, (run, key, tmp_dir, buffer_size)))
+                    if(len(pending) >= processes):
+                        runs.append(pending.popleft().get())
+                        temps.append(runs[-1])
+                while(pending):
+                    runs.append(pending.popleft().get())
+                    temps.append(runs[-1])
+            finally:
+                # after a failure, wait for the runs still in flight before
+                # the pool is torn down, so their files are known and removed
+                for result in pending:
+                    try:
+                        temps.append(result.get())
+                    except Exception:
+                        pass
+    else:
+        for run in _read_runs(input_path, run_size, buffer_size):
+            runs.append(_sort_run(run, key, tmp_dir, buffer_size))
+            temps.append(runs[-1])
+    return runs
+
+
+def _merge_runs(runs, output_path, key, fan_in, buffer_size, tmp_dir, temps):
+    """Merges the run files into output_path, in passes of at most fan_in runs."""
+    # merge in passes while there are too many runs to open at once
+    while(len(runs) > fan_in):
+        merged = []
+        for i in range(0, len(runs), fan_in):
+            group = runs[i:i + fan_in]
+            fd, path = tempfile.mkstemp(suffix = '.run', dir = tmp_dir)
+            os.close(fd)
+            temps.append(path)
+            merged.append(path)
+            merge_files(group, path, key, buffer_size)
+            for p in group:
+                os.remove(p)
+        runs = merged
+    if(runs):
+        merge_files(runs, output_path, key, buffer_size)
+    else:
+        _write_lines(output_path, [], buffer_size)
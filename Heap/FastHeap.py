@@ -0,0 +1,122 @@
+"""
+    A high throughput Heap/Priority queue implementation.
+    Entries are (key, seq, value) tuples kept with the C accelerated heapq
+    module, so keys must be natively comparable (numbers, strings, tuples).
+    The seq number breaks ties, so values are never compared and equal keys
+    come out in insertion order.
+"""
+import heapq
+import itertools
+
+from Heap import Node
+
+
+class FastHeap:
+    """A Heap of (key, seq, value) tuples."""
+    def __init__(self, values: list = ()):
+        """Creates FastHeap.
+
+        Args:
+            values: Nodes or (key, value) pairs.
+
+        Running Time:
+            O(n)
+        """
+        self._seq = itertools.count()
+        self.heap = [self._entry(v) for v in values]
+        heapq.heapify(self.heap)
+
+    def _entry(self, v):
+        # O(1)
+        if(isinstance(v, Node)):
+            return (v.key, next(self._seq), v.val)
+        k, value = v
+        return (k, next(self._seq), value)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, k, value = None):
+        """Pushes value with key k.
+
+        Running Time:
+            O(log(n))
+        """
+        heapq.heappush(self.heap, (k, next(self._seq), value))
+
+    def pop(self):
+        """Removes and returns the (key, value) pair with minimum key.
+
+        Raises:
+            IndexError: if the heap is empty.
+
+        Running Time:
+            O(log(n))
+        """
+        k, _, value = heapq.heappop(self.heap)
+        return k, value
+
+    def peek(self):
+        """Returns the (key, value) pair with minimum key.
+
+        Raises:
+            IndexError: if the heap is empty.
+
+        Running Time:
+            O(1)
+        """
+        k, _, value = self.heap[0]
+        return k, value
+
+    def pushpop(self, k, value = None):
+        """Pushes then pops, faster than calling push and pop.
+
+        Running Time:
+            O(log(n))
+        """
+        k, _, value = heapq.heappushpop(self.heap, (k, next(self._seq), value))
+        return k, value
+
+    # the same node based API as Heap
+    def min(self):
+        """Returns a node with minimum key from the heap.
+
+        Running Time:
+            O(1)
+        """
+        if(len(self.heap) > 0):
+            k, _, value = self.heap[0]
+            return Node(value, k)
+        else:
+            return None
+
+    def extract_min(self):
+        """Removes and returns a node with minimum key from the heap.
+
+        Running Time:
+            O(log(n))
+        """
+        if(len(self.heap) > 0):
+            k, value = self.pop()
+            return Node(value, k)
+        else:
+            return None
+
+    def insert(self, node):
+        """Inserts a node into the FastHeap.
+
+        Args:
+            node: The node to be inserted.
+
+        Running Time:
+            O(log(n))
+        """
+        self.push(node.key, node.val)
+
+    def is_empty(self):
+        """Returns whether the heap is empty.
+
+        Running Time:
+            O(1)
+        """
+        return len(self.heap) == 0
@@ -2,6 +2,7 @@
     A Heap/Priority queue implementation
     Last modified at: 2020/4/28
 """
+import heapq
 
 class Node:
     """A node in the Heap."""
@@ -17,6 +18,8 @@ class Node:
         """
         self.key = k
         self.val = value
+        # position in the heap list, None when not in a heap
+        self.idx = None
 
     def __str__(self):
         return f"{self.__class__.__name__}({self.key}, {self.val})"
@@ -28,7 +31,7 @@ class Heap:
         """Creates Heap.
         
         Running Time:
-            O(n*log(n))
+            O(n)
         """
         self.heap = []
         self._build_heap(values)
@@ -40,18 +43,23 @@ class Heap:
             values: The unordered values.
 
         Running Time:
-            O(n*log(n))
+            O(n)
         """
-        lastIdx = len(values) - 1
+        self.heap = list(values)
+        for i, node in enumerate(self.heap):
+            node.idx = i
+        self._heapify()
+        # debug
+        # self.__check_ri()
+
+    def _heapify(self):
+        # O(n)
+        lastIdx = len(self.heap) - 1
         # start from last nodes that has child
         startFrom = self._get_parent_idx(lastIdx)
-        for i in values:
-            self.heap.append(i)
         # check up down
         for i in range(startFrom, -1, -1):
             self._heap_down(i)
-        # debug
-        # self.__check_ri()
 
     def _get_parent_idx(self, idx):
         # O(1)
@@ -65,34 +73,53 @@ class Heap:
         # O(1)
         return idx * 2 + 2
 
+    def _swap(self, i, j):
+        # O(1)
+        # keeps every node's idx in step with its position
+        self.heap[i], self.heap[j] = self.heap[j], self.heap[i]
+        self.heap[i].idx = i
+        self.heap[j].idx = j
+
     def _heap_down(self, idx):
         # O(log(n))
-        smaller_idx = self.__get_smaller_child_idx(idx)
-        if(not smaller_idx == idx): # if equals, we're done
-            # if not, swap and check next node
-            self.heap[idx], self.heap[smaller_idx] = self.heap[smaller_idx], self.heap[idx]
-            self._heap_down(smaller_idx)
+        # move the node down with a loop: children are shifted up into
+        # the hole and the node is written once at its final place
+        heap = self.heap
+        n = len(heap)
+        if(idx >= n):
+            return
+        node = heap[idx]
+        key = node.key
+        while(True):
+            l = idx * 2 + 1
+            if(l >= n):
+                break
+            r = l + 1
+            smaller_idx = r if r < n and heap[r].key < heap[l].key else l
+            smaller = heap[smaller_idx]
+            if(not smaller.key < key): # we're done
+                break
+            heap[idx] = smaller
+            smaller.idx = idx
+            idx = smaller_idx
+        heap[idx] = node
+        node.idx = idx
 
     def _heap_top(self, idx):
         # O(log(n))
-        parent_idx = self._get_parent_idx(idx)
-        if(parent_idx >= 0 and self.heap[parent_idx].key > self.heap[idx].key): # if not, we're done
-            # if true, swap and check next node
-            self.heap[idx], self.heap[parent_idx] = self.heap[parent_idx], self.heap[idx]
-            self._heap_top(parent_idx)
-                
-
-    # private
-    def __get_smaller_child_idx(self, idx):
-        # O(1)
-        l = self._get_left_child_idx(idx)
-        r = self._get_right_child_idx(idx)
-        smaller_idx = idx
-        if(l < len(self.heap) and self.heap[l].key < self.heap[smaller_idx].key):
-            smaller_idx = l
-        if(r < len(self.heap) and self.heap[r].key < self.heap[smaller_idx].key):
-            smaller_idx = r
-        return smaller_idx
+        heap = self.heap
+        node = heap[idx]
+        key = node.key
+        while(idx > 0):
+            parent_idx = (idx - 1) // 2
+            parent = heap[parent_idx]
+            if(not parent.key > key): # we're done
+                break
+            heap[idx] = parent
+            parent.idx = idx
+            idx = parent_idx
+        heap[idx] = node
+        node.idx = idx
 
     # public
     def min(self):
@@ -114,8 +141,9 @@ class Heap:
         """
         if(len(self.heap) > 0):
             # swap first and last
-            self.heap[-1], self.heap[0] = self.heap[0], self.heap[-1]
+            self._swap(0, len(self.heap) - 1)
             minimum = self.heap.pop()
+            minimum.idx = None
             # heapy root
             self._heap_down(0)
             # debug
@@ -131,14 +159,173 @@ class Heap:
         Args:
             node: The node to be inserted.
         
+        Returns:
+            The node, which is the handle for decrease_key, update and remove.
+
         Running Time:
             O(log(n))
         """
+        node.idx = len(self.heap)
         self.heap.append(node)
         # check bottom up
         self._heap_top(len(self.heap)-1)
         # debug
         # self.__check_ri()
+        return node
+
+    def _check_handle(self, node):
+        # O(1)
+        if(node.idx is None or node.idx >= len(self.heap) or self.heap[node.idx] is not node):
+            raise ValueError("node is not in this heap")
+
+    def decrease_key(self, node, k):
+        """Lowers the key of a node in the Heap.
+
+        Args:
+            node: The handle returned by insert.
+            k: The new key, which must not be bigger than the current one.
+
+        Running Time:
+            O(log(n))
+        """
+        self._check_handle(node)
+        if(k > node.key):
+            raise ValueError("new key is bigger than the current key")
+        node.key = k
+        self._heap_top(node.idx)
+
+    def update(self, node, k):
+        """Changes the key of a node in the Heap.
+
+        Args:
+            node: The handle returned by insert.
+            k: The new key.
+
+        Running Time:
+            O(log(n))
+        """
+        self._check_handle(node)
+        node.key = k
+        # only one of them moves the node
+        self._heap_top(node.idx)
+        self._heap_down(node.idx)
+
+    def remove(self, node):
+        """Removes a node from the Heap.
+
+        Args:
+            node: The handle returned by insert.
+
+        Returns:
+            The removed node.
+
+        Running Time:
+            O(log(n))
+        """
+        self._check_handle(node)
+        idx = node.idx
+        last = len(self.heap) - 1
+        self._swap(idx, last)
+        self.heap.pop()
+        node.idx = None
+        if(idx < last):
+            # the old last node now sits at idx, move it either way
+            moved = self.heap[idx]
+            self._heap_top(idx)
+            self._heap_down(moved.idx)
+        return node
+
+    def replace_min(self, node):
+        """Removes and returns the node with minimum key, then inserts node,
+        with a single sift.
+
+        Args:
+            node: The node to be inserted.
+
+        Returns:
+            The removed node, or None if the heap was empty.
+
+        Running Time:
+            O(log(n))
+        """
+        if(len(self.heap) == 0):
+            self.insert(node)
+            return None
+        minimum = self.heap[0]
+        minimum.idx = None
+        self.heap[0] = node
+        node.idx = 0
+        self._heap_down(0)
+        return minimum
+
+    def push_many(self, nodes):
+        """Inserts many nodes into the Heap.
+
+        A batch that is large compared to the heap is appended and the
+        whole heap is rebuilt bottom-up, otherwise the nodes are inserted
+        one by one.
+
+        Args:
+            nodes: An iterable of nodes.
+
+        Running Time:
+            O(min(n + k, k*log(n + k))), k is the number of nodes.
+        """
+        nodes = list(nodes)
+        n = len(self.heap) + len(nodes)
+        if(len(nodes) * max(n.bit_length(), 1) > n):
+            start = len(self.heap)
+            self.heap.extend(nodes)
+            for i in range(start, n):
+                self.heap[i].idx = i
+            self._heapify()
+        else:
+            for node in nodes:
+                self.insert(node)
+
+    def pop_many(self, k):
+        """Removes and returns up to k nodes with the smallest keys, in order.
+
+        Running Time:
+            O(k*log(n))
+        """
+        result = []
+        while(len(result) < k and len(self.heap) > 0):
+            result.append(self.extract_min())
+        return result
+
+    def nsmallest(self, k):
+        """Returns up to k nodes with the smallest keys, in order,
+        without changing the heap.
+
+        Only the top of the heap is explored: a small side heap of
+        candidate positions holds the children of every node returned.
+
+        Running Time:
+            O(k*log(k))
+        """
+        heap = self.heap
+        result = []
+        if(k <= 0 or len(heap) == 0):
+            return result
+        candidates = [(heap[0].key, 0)]
+        while(candidates and len(result) < k):
+            _, idx = heapq.heappop(candidates)
+            result.append(heap[idx])
+            last = min(self._get_right_child_idx(idx), len(heap) - 1)
+            for child in range(self._get_left_child_idx(idx), last + 1):
+                heapq.heappush(candidates, (heap[child].key, child))
+        return result
+
+    def meld(self, other):
+        """Moves every node of other into this Heap, other becomes empty.
+
+        Running Time:
+            O(min(n + m, m*log(n + m))), m is the size of other.
+        """
+        nodes = other.heap
+        other.heap = []
+        self.push_many(nodes)
 
     def is_empty(self):
         """Inserts a node into the Heap.
@@ -178,4 +365,86 @@ class Heap:
             r = self._get_right_child_idx(i)
             if(r <= lastIdx):
                 assert(self.heap[i].key <= self.heap[r].key)
+        for i, node in enumerate(self.heap):
+            assert(node.idx == i)
+
+
+class DaryHeap(Heap):
+    """A Heap where every node has up to arity children.
+
+    A bigger arity makes the heap shallower, so insert and decrease_key
+    touch fewer levels, while extract_min compares more children per level.
+    """
+    def __init__(self, values: list, arity: int = 4):
+        """Creates DaryHeap.
+
+        Args:
+            values: The unordered values.
+            arity: The number of children per node, at least 2.
+
+        Running Time:
+            O(n)
+        """
+        if(arity < 2):
+            raise ValueError("arity must be at least 2")
+        self.arity = arity
+        super().__init__(values)
 
+    def _get_parent_idx(self, idx):
+        # O(1)
+        return (idx - 1) // self.arity
+
+    def _get_left_child_idx(self, idx):
+        # O(1)
+        # the first child
+        return idx * self.arity + 1
+
+    def _get_right_child_idx(self, idx):
+        # O(1)
+        # the last child
+        return idx * self.arity + self.arity
+
+    def _heap_down(self, idx):
+        # O(arity*log(n)/log(arity))
+        heap = self.heap
+        n = len(heap)
+        if(idx >= n):
+            return
+        d = self.arity
+        node = heap[idx]
+        key = node.key
+        while(True):
+            first = idx * d + 1
+            if(first >= n):
+                break
+            smaller_idx = first
+            smaller_key = heap[first].key
+            for c in range(first + 1, min(first + d, n)):
+                if(heap[c].key < smaller_key):
+                    smaller_idx = c
+                    smaller_key = heap[c].key
+            if(not smaller_key < key): # we're done
+                break
+            smaller = heap[smaller_idx]
+            heap[idx] = smaller
+            smaller.idx = idx
+            idx = smaller_idx
+        heap[idx] = node
+        node.idx = idx
+
+    def _heap_top(self, idx):
+        # O(log(n)/log(arity))
+        heap = self.heap
+        d = self.arity
+        node = heap[idx]
+        key = node.key
+        while(idx > 0):
+            parent_idx = (idx - 1) // d
+            parent = heap[parent_idx]
+            if(not parent.key > key): # we're done
+                break
+            heap[idx] = parent
+            parent.idx = idx
+            idx = parent_idx
+        heap[idx] = node
+        node.idx = idx
@@ -0,0 +1,218 @@
+"""
+    A Pairing Heap implementation.
+    A pairing heap is a heap ordered multiway tree, so two heaps are
+    melded by linking their roots: insert and meld take O(1), and
+    decrease_key takes O(1) amortized (O(log(n)) in the worst analysis).
+    It has the same min/extract_min/insert interface as Heap and takes
+    the same Node objects.
+"""
+
+
+class _Owner:
+    """
+    Marks the nodes of one heap. meld points the owner of the emptied
+    heap at the owner of the other heap, so melded nodes need no update:
+    the owner of a node is found by following the links (union-find).
+    """
+    __slots__ = ('parent',)
+
+    def __init__(self):
+        self.parent = None
+
+    def find(self):
+        # O(1) amortized
+        root = self
+        while(root.parent is not None):
+            root = root.parent
+        # path compression
+        node = self
+        while(node is not root):
+            node.parent, node = root, node.parent
+        return root
+
+
+class PairingHeap:
+    """
+    A Pairing Heap. Every node in it gets three links:
+        child: the leftmost child
+        sibling: the next sibling on the right
+        prev: the left sibling, or the parent for a leftmost child
+    """
+    def __init__(self, values: list = ()):
+        """Creates PairingHeap.
+
+        Running Time:
+            O(n)
+        """
+        self.root = None
+        self.size = 0
+        self._owner = _Owner()
+        for node in values:
+            self.insert(node)
+
+    def __len__(self):
+        return self.size
+
+    @staticmethod
+    def _link(a, b):
+        # O(1)
+        # links two roots, the bigger one becomes the leftmost child
+        if(b.key < a.key):
+            a, b = b, a
+        b.prev = a
+        b.sibling = a.child
+        if(a.child is not None):
+            a.child.prev = b
+        a.child = b
+        return a
+
+    @staticmethod
+    def _cut(node):
+        # O(1)
+        # detaches the subtree rooted at node from its parent
+        if(node.prev.child is node):
+            node.prev.child = node.sibling
+        else:
+            node.prev.sibling = node.sibling
+        if(node.sibling is not None):
+            node.sibling.prev = node.prev
+        node.prev = None
+        node.sibling = None
+
+    @staticmethod
+    def _merge_pairs(first):
+        # O(k), k is the number of siblings
+        # two pass pairing, with a list instead of recursion:
+        # link siblings in pairs from left to right,
+        # then link the pairs from right to left
+        pairs = []
+        node = first
+        while(node is not None):
+            a = node
+            b = node.sibling
+            node = b.sibling if b is not None else None
+            a.prev = a.sibling = None
+            if(b is not None):
+                b.prev = b.sibling = None
+                a = PairingHeap._link(a, b)
+            pairs.append(a)
+        if(not pairs):
+            return None
+        result = pairs.pop()
+        while(pairs):
+            result = PairingHeap._link(pairs.pop(), result)
+        return result
+
+    def min(self):
+        """Returns the node with minimum key from the heap.
+
+        Running Time:
+            O(1)
+        """
+        return self.root
+
+    def extract_min(self):
+        """Removes and returns the node with minimum key from the heap.
+
+        Running Time:
+            O(log(n)) amortized
+        """
+        minimum = self.root
+        if(minimum is None):
+            return None
+        self.root = PairingHeap._merge_pairs(minimum.child)
+        minimum.child = None
+        minimum.owner = None
+        self.size -= 1
+        return minimum
+
+    def insert(self, node):
+        """Inserts a node into the PairingHeap.
+
+        Args:
+            node: The node to be inserted.
+
+        Returns:
+            The node, which is the handle for decrease_key and remove.
+
+        Running Time:
+            O(1)
+        """
+        node.child = node.sibling = node.prev = None
+        node.owner = self._owner
+        self.root = node if self.root is None else PairingHeap._link(self.root, node)
+        self.size += 1
+        return node
+
+    def meld(self, other):
+        """Moves every node of other into this heap, other becomes empty.
+
+        Running Time:
+            O(1)
+        """
+        if(other is self):
+            return
+        if(other.root is not None):
+            self.root = other.root if self.root is None else PairingHeap._link(self.root, other.root)
+        self.size += other.size
+        # the nodes of other now belong to this heap
+        other._owner.parent = self._owner
+        other._owner = _Owner()
+        other.root = None
+        other.size = 0
+
+    def _check_handle(self, node):
+        # O(1) amortized
+        owner = getattr(node, 'owner', None)
+        if(owner is None or owner.find() is not self._owner):
+            raise ValueError("node is not in this heap")
+
+    def decrease_key(self, node, k):
+        """Lowers the key of a node in this heap.
+
+        Args:
+            node: The handle returned by insert.
+            k: The new key, which must not be bigger than the current one.
+
+        Running Time:
+            O(1) amortized
+        """
+        self._check_handle(node)
+        if(k > node.key):
+            raise ValueError("new key is bigger than the current key")
+        node.key = k
+        if(node is not self.root):
+            PairingHeap._cut(node)
+            self.root = PairingHeap._link(self.root, node)
+
+    def remove(self, node):
+        """Removes a node from this heap.
+
+        Args:
+            node: The handle returned by insert.
+
+        Returns:
+            The removed node.
+
+        Running Time:
+            O(log(n)) amortized
+        """
+        self._check_handle(node)
+        if(node is self.root):
+            return self.extract_min()
+        PairingHeap._cut(node)
+        sub = PairingHeap._merge_pairs(node.child)
+        node.child = None
+        node.owner = None
+        if(sub is not None):
+            self.root = PairingHeap._link(self.root, sub)
+        self.size -= 1
+        return node
+
+    def is_empty(self):
+        """Returns whether the heap is empty.
+
+        Running Time:
+            O(1)
+        """
+        return self.root is None
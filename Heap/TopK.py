@@ -0,0 +1,85 @@
+"""
+    A bounded top-k selector built on Heap.
+    It keeps the k items with the largest keys seen in a stream in a
+    min-heap of size k, so memory stays O(k) however long the stream is.
+"""
+
+from Heap import Heap, Node
+
+
+class TopK:
+    """Keeps the k items with the largest keys."""
+    def __init__(self, k: int, key = None):
+        """Creates TopK.
+
+        Args:
+            k: The number of items to keep.
+            key: Maps an item to its score, defaults to the item itself.
+
+        Running Time:
+            O(1)
+        """
+        if(k < 0):
+            raise ValueError("k must not be negative")
+        self.k = k
+        self.key = key
+        self.heap = Heap([])
+
+    def __len__(self):
+        return len(self.heap.heap)
+
+    def push(self, item):
+        """Offers one item.
+
+        Returns:
+            Whether the item is kept (for now).
+
+        Running Time:
+            O(1) if rejected, O(log(k)) otherwise.
+        """
+        score = item if self.key is None else self.key(item)
+        heap = self.heap.heap
+        if(len(heap) < self.k):
+            self.heap.insert(Node(item, score))
+            return True
+        # the root is the worst item kept, anything not better is rejected
+        if(self.k == 0 or not score > heap[0].key):
+            return False
+        self.heap.replace_min(Node(item, score))
+        return True
+
+    def extend(self, items):
+        """Offers every item of an iterable, can be called once per chunk.
+
+        Running Time:
+            O(m*log(k)) worst case, O(m) when most items are rejected.
+        """
+        key = self.key
+        k = self.k
+        heap = self.heap
+        for item in items:
+            score = item if key is None else key(item)
+            if(len(heap.heap) < k):
+                heap.insert(Node(item, score))
+            elif(k > 0 and score > heap.heap[0].key):
+                heap.replace_min(Node(item, score))
+
+    def threshold(self):
+        """Returns the score an item must beat to be kept, None while
+        fewer than k items are kept.
+
+        Running Time:
+            O(1)
+        """
+        if(len(self.heap.heap) < self.k or self.k == 0):
+            return None
+        return self.heap.heap[0].key
+
+    def result(self):
+        """Returns the kept items, best first.
+
+        Running Time:
+            O(k*log(k))
+        """
+        nodes = sorted(self.heap.heap, key = lambda node: node.key, reverse = True)
+        return [node.val for node in nodes]
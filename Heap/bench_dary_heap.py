@@ -0,0 +1,69 @@
+"""
+    Arity sweep for DaryHeap on insert-heavy, extract-heavy, mixed and
+    decrease-key-heavy workloads; arity 2 is the plain binary Heap layout.
+    The fastest arity of every workload is marked with a *.
+
+    Usage: python bench_dary_heap.py [n]
+"""
+import random
+import sys
+import time
+
+from Heap import DaryHeap, Node
+
+ARITIES = (2, 3, 4, 8, 16)
+
+
+def insert_heavy(heap, rng, n):
+    # fill up, then drain a tenth
+    for _ in range(n):
+        heap.insert(Node(None, rng.random()))
+    for _ in range(n // 10):
+        heap.extract_min()
+
+
+def extract_heavy(heap, rng, n):
+    # one bottom-up build, then drain everything
+    heap.push_many([Node(None, rng.random()) for _ in range(n)])
+    while(not heap.is_empty()):
+        heap.extract_min()
+
+
+def mixed(heap, rng, n):
+    for _ in range(n // 2):
+        heap.insert(Node(None, rng.random()))
+    for _ in range(n):
+        if(rng.random() < 0.5):
+            heap.insert(Node(None, rng.random()))
+        else:
+            heap.extract_min()
+
+
+def decrease_key_heavy(heap, rng, n):
+    nodes = [heap.insert(Node(None, rng.random())) for _ in range(n // 4)]
+    for _ in range(n):
+        node = nodes[rng.randrange(len(nodes))]
+        heap.decrease_key(node, node.key * rng.random())
+    for _ in range(n // 4):
+        heap.extract_min()
+
+
+WORKLOADS = (insert_heavy, extract_heavy, mixed, decrease_key_heavy)
+
+
+def main(n):
+    print("%-20s" % "workload" + "".join("%10s" % ("d=%d" % d) for d in ARITIES))
+    for workload in WORKLOADS:
+        times = []
+        for arity in ARITIES:
+            heap = DaryHeap([], arity)
+            start = time.perf_counter()
+            workload(heap, random.Random(1), n)
+            times.append(time.perf_counter() - start)
+        best = min(times)
+        print("%-20s" % workload.__name__ +
+              "".join("%9.3f%s" % (t, '*' if t == best else ' ') for t in times))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
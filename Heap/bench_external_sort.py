@@ -0,0 +1,86 @@
+"""
+    Benchmark for external_sort on a local file:
+    generates a text file of random fixed width lines of the given size,
+    then sorts it with processes=0 and processes=N and reports the
+    throughput of run generation (read, sort, write the runs) and of the
+    merge, plus the peak RSS of the sorting process and of its workers.
+    Every configuration runs in a fresh interpreter, so the peak RSS
+    of one does not hide the next.
+
+    Usage: python bench_external_sort.py [size_mb] [processes] [run_size] [tmp_dir]
+"""
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from ExternalSort import _make_runs, _merge_runs
+
+LINE = 17                   # 16 hex digits and a newline
+BUFFER_SIZE = 1 << 20
+FAN_IN = 64
+
+
+def generate(path, size_mb, seed = 1):
+    rng = random.Random(seed)
+    lines = size_mb * (1 << 20) // LINE
+    with open(path, 'w', buffering = BUFFER_SIZE) as f:
+        for i in range(0, lines, 65536):
+            f.writelines(['%016x\n' % rng.getrandbits(64) for _ in range(min(65536, lines - i))])
+    return lines
+
+
+def run_one(input_path, processes, run_size, tmp_dir):
+    # one configuration, in its own interpreter; prints one result line
+    size_mb = os.path.getsize(input_path) / (1 << 20)
+    fd, output_path = tempfile.mkstemp(suffix = '.out', dir = tmp_dir)
+    os.close(fd)
+    temps = []
+    try:
+        start = time.perf_counter()
+        runs = _make_runs(input_path, None, run_size, BUFFER_SIZE, processes, tmp_dir, temps)
+        made = time.perf_counter()
+        _merge_runs(runs, output_path, None, FAN_IN, BUFFER_SIZE, tmp_dir, temps)
+        merged = time.perf_counter()
+    finally:
+        for path in temps:
+            if(os.path.exists(path)):
+                os.remove(path)
+        os.remove(output_path)
+    # ru_maxrss is in KiB on Linux
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    worker_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    print("%-10d %6d %14.1f %14.1f %12.1f %12.1f %14.1f" % (
+        processes, len(runs), size_mb / (made - start), size_mb / (merged - made),
+        merged - start, rss, worker_rss))
+
+
+def main(size_mb, processes, run_size, tmp_dir):
+    fd, input_path = tempfile.mkstemp(suffix = '.txt', dir = tmp_dir)
+    os.close(fd)
+    try:
+        start = time.perf_counter()
+        lines = generate(input_path, size_mb)
+        print("%d MiB, %d lines, generated in %.1fs, runs of %d lines" % (
+            size_mb, lines, time.perf_counter() - start, run_size))
+        print("%-10s %6s %14s %14s %12s %12s %14s" % ("processes", "runs", "runs MiB/s",
+                                                     "merge MiB/s", "total s", "peak MiB",
+                                                     "worker MiB"))
+        for p in (0, processes):
+            subprocess.run([sys.executable, __file__, '--one', input_path, str(p),
+                            str(run_size), tmp_dir or ''], check = True)
+    finally:
+        os.remove(input_path)
+
+
+if __name__ == '__main__':
+    if(len(sys.argv) > 1 and sys.argv[1] == '--one'):
+        run_one(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]), sys.argv[5] or None)
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 1024,
+             int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1,
+             int(sys.argv[3]) if len(sys.argv) > 3 else 1000000,
+             sys.argv[4] if len(sys.argv) > 4 else None)
@@ -0,0 +1,63 @@
+"""
+    Push/pop throughput benchmark for the node based Heap against
+    FastHeap (heapq over (key, seq, value) tuples) and bare heapq.
+
+    Usage: python bench_heap.py [n]
+"""
+import heapq
+import random
+import sys
+import time
+
+from FastHeap import FastHeap
+from Heap import Heap, Node
+
+
+def bench_heap(keys):
+    heap = Heap([])
+    start = time.perf_counter()
+    for k in keys:
+        heap.insert(Node(None, k))
+    push = time.perf_counter() - start
+    start = time.perf_counter()
+    while(not heap.is_empty()):
+        heap.extract_min()
+    return push, time.perf_counter() - start
+
+
+def bench_fast_heap(keys):
+    heap = FastHeap()
+    start = time.perf_counter()
+    for k in keys:
+        heap.push(k)
+    push = time.perf_counter() - start
+    start = time.perf_counter()
+    while(len(heap) > 0):
+        heap.pop()
+    return push, time.perf_counter() - start
+
+
+def bench_heapq(keys):
+    heap = []
+    start = time.perf_counter()
+    for k in keys:
+        heapq.heappush(heap, k)
+    push = time.perf_counter() - start
+    start = time.perf_counter()
+    while(heap):
+        heapq.heappop(heap)
+    return push, time.perf_counter() - start
+
+
+def main(n):
+    rng = random.Random(1)
+    keys = [rng.random() for _ in range(n)]
+    print("%-10s %16s %16s" % ("heap", "push Mops/s", "pop Mops/s"))
+    for name, bench in (("Heap", bench_heap), ("FastHeap", bench_fast_heap),
+                        ("heapq", bench_heapq)):
+        push, pop = bench(keys)
+        print("%-10s %16.2f %16.2f" % (name, n / push / 1e6, n / pop / 1e6))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,83 @@
+"""
+    Benchmark for PairingHeap against the array Heap:
+    1. meld-heavy: shards are melded into one queue over and over,
+       with a few inserts and extract_mins in between;
+    2. Dijkstra: shortest paths on a random sparse graph, driven by
+       insert, extract_min and decrease_key on node handles.
+
+    Usage: python bench_pairing_heap.py [shards] [shard_size] [vertices]
+"""
+import random
+import sys
+import time
+
+from Heap import Heap, Node
+from PairingHeap import PairingHeap
+
+ROUNDS = 20
+
+
+def make_heap(heap_class, nodes = ()):
+    return heap_class(list(nodes))
+
+
+def meld_heavy(heap_class, shards, shard_size, rounds = ROUNDS, seed = 1):
+    rng = random.Random(seed)
+    queue = make_heap(heap_class)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for _ in range(shards):
+            shard = make_heap(heap_class)
+            for _ in range(shard_size):
+                shard.insert(Node(None, rng.random()))
+            queue.meld(shard)
+        for _ in range(shards):
+            queue.extract_min()
+    return time.perf_counter() - start
+
+
+def random_graph(n, degree, seed = 1):
+    rng = random.Random(seed)
+    return [[(rng.randrange(n), rng.random()) for _ in range(degree)] for _ in range(n)]
+
+
+def dijkstra(heap_class, graph, source = 0):
+    start = time.perf_counter()
+    dist = [float('inf')] * len(graph)
+    handles = [None] * len(graph)
+    done = [False] * len(graph)
+    dist[source] = 0.0
+    queue = make_heap(heap_class)
+    handles[source] = queue.insert(Node(source, 0.0))
+    while(not queue.is_empty()):
+        u = queue.extract_min().val
+        done[u] = True
+        for v, w in graph[u]:
+            d = dist[u] + w
+            if(not done[v] and d < dist[v]):
+                dist[v] = d
+                if(handles[v] is None):
+                    handles[v] = queue.insert(Node(v, d))
+                else:
+                    queue.decrease_key(handles[v], d)
+    return time.perf_counter() - start, dist
+
+
+def main(shards, shard_size, vertices):
+    print("meld-heavy: %d rounds of %d shards of %d nodes" % (ROUNDS, shards, shard_size))
+    for heap_class in (Heap, PairingHeap):
+        print("  %-12s %8.3fs" % (heap_class.__name__, meld_heavy(heap_class, shards, shard_size)))
+    graph = random_graph(vertices, 8)
+    print("dijkstra: %d vertices, %d edges" % (vertices, 8 * vertices))
+    results = []
+    for heap_class in (Heap, PairingHeap):
+        elapsed, dist = dijkstra(heap_class, graph)
+        results.append(dist)
+        print("  %-12s %8.3fs" % (heap_class.__name__, elapsed))
+    assert results[0] == results[1]
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 100,
+         int(sys.argv[3]) if len(sys.argv) > 3 else 100000)
@@ -0,0 +1,228 @@
+"""
+    A concurrent skip list implementation (the lazy skip list).
+    search never takes a lock. add and erase lock only the predecessors
+    of the node they change, validate that nothing moved, and retry if
+    it did. erase first marks the node (logical deletion), then unlinks it.
+    It is a set: every key is stored at most once.
+"""
+import math
+import random
+import threading
+import time
+
+
+class Node:
+    """
+    Attributes:
+        key: the node's key
+        next: the forward pointers, next[i] is the next node on level i
+        lock: taken by writers that change next or marked
+        marked: set once the node is logically deleted
+        fully_linked: set once the node is linked on all of its levels
+    """
+    __slots__ = ('key', 'next', 'lock', 'marked', 'fully_linked')
+
+    def __init__(self, key, level):
+        """
+        Create a node.
+
+        Running Time:
+            O(level)
+        """
+        self.key = key
+        self.next = [None] * level
+        self.lock = threading.RLock()
+        self.marked = False
+        self.fully_linked = False
+
+
+class ConcurrentSkiplist:
+    """
+    Attributes:
+        head: the head sentinel, its key is never compared
+        max_level: the most levels a tower can have
+    """
+    def __init__(self, p = 0.5, max_level = 32, seed = None):
+        """
+        Create a ConcurrentSkiplist.
+
+        Args:
+            p: the probability that a tower grows one more level, 0 < p < 1
+            max_level: the most levels a tower can have
+            seed: seeds the random.Random used to draw tower heights
+
+        Running Time:
+            O(max_level)
+        """
+        if(not 0 < p < 1):
+            raise ValueError("p must be between 0 and 1")
+        if(max_level < 1):
+            raise ValueError("max_level must be at least 1")
+        self.max_level = max_level
+        self._rng = random.Random(seed)
+        self._log_p = math.log(p)
+        self.head = Node(None, max_level)
+        self.head.fully_linked = True
+
+    def _random_level(self):
+        # O(1)
+        level = 1 + int(math.log(1.0 - self._rng.random()) / self._log_p)
+        return level if level < self.max_level else self.max_level
+
+    def _find(self, key, preds, succs):
+        """
+        Fill preds[i] with the last node whose key is less than key on
+        level i, and succs[i] with the node after it. Takes no lock.
+
+        Return:
+            The highest level where a node with key was seen, or -1
+
+        Running Time:
+            O(log(n)) w.h.p.
+        """
+        found = -1
+        pred = self.head
+        for level in range(self.max_level - 1, -1, -1):
+            curr = pred.next[level]
+            while(curr is not None and curr.key < key):
+                pred = curr
+                curr = pred.next[level]
+            if(found == -1 and curr is not None and curr.key == key):
+                found = level
+            preds[level] = pred
+            succs[level] = curr
+        return found
+
+    def search(self, target) -> bool:
+        """
+        Query whether target is in the list, without locking.
+
+        Running Time:
+            O(log(n)) w.h.p.
+        """
+        preds = [None] * self.max_level
+        succs = [None] * self.max_level
+        found = self._find(target, preds, succs)
+        return (found != -1 and succs[found].fully_linked and
+                not succs[found].marked)
+
+    def add(self, num) -> bool:
+        """
+        Add num to the list.
+
+        Return:
+            Whether num was added (False if it was already there)
+
+        Running Time:
+            O(log(n)) w.h.p. without contention
+        """
+        top = self._random_level()
+        preds = [None] * self.max_level
+        succs = [None] * self.max_level
+        while(True):
+            found = self._find(num, preds, succs)
+            if(found != -1):
+                node = succs[found]
+                if(not node.marked):
+                    # another add is linking it, wait until it is visible
+                    while(not node.fully_linked):
+                        # yield, so the linking thread can run
+                        time.sleep(0)
+                    return False
+                # it is being erased, try again
+                continue
+            locked = []
+            try:
+                valid = True
+                for level in range(top):
+                    pred = preds[level]
+                    succ = succs[level]
+                    pred.lock.acquire()
+                    locked.append(pred)
+                    # nothing may have changed between pred and succ
+                    valid = (not pred.marked and (succ is None or not succ.marked)
+                             and pred.next[level] is succ)
+                    if(not valid):
+                        break
+                if(not valid):
+                    continue
+                node = Node(num, top)
+                for level in range(top):
+                    node.next[level] = succs[level]
+                # link bottom up, so a reader never sees a level skip it
+                for level in range(top):
+                    preds[level].next[level] = node
+                node.fully_linked = True
+                return True
+            finally:
+                for pred in locked:
+                    pred.lock.release()
+
+    def erase(self, num) -> bool:
+        """
+        Delete num from the list.
+
+        Return:
+            Whether num was deleted (False if it was not there)
+
+        Running Time:
+            O(log(n)) w.h.p. without contention
+        """
+        preds = [None] * self.max_level
+        succs = [None] * self.max_level
+        victim = None
+        is_marked = False
+        top = 0
+        while(True):
+            found = self._find(num, preds, succs)
+            if(found != -1):
+                victim = succs[found]
+            if(not is_marked and not (found != -1 and victim.fully_linked and
+                                      len(victim.next) - 1 == found and
+                                      not victim.marked)):
+                return False
+            if(not is_marked):
+                top = len(victim.next)
+                victim.lock.acquire()
+                if(victim.marked):
+                    # another erase got there first
+                    victim.lock.release()
+                    return False
+                # logical deletion: readers stop seeing it from here
+                victim.marked = True
+                is_marked = True
+            locked = []
+            try:
+                valid = True
+                for level in range(top):
+                    pred = preds[level]
+                    pred.lock.acquire()
+                    locked.append(pred)
+                    valid = not pred.marked and pred.next[level] is victim
+                    if(not valid):
+                        break
+                if(not valid):
+                    continue
+                # physical deletion, top down
+                for level in range(top - 1, -1, -1):
+                    preds[level].next[level] = victim.next[level]
+                victim.lock.release()
+                return True
+            finally:
+                for pred in locked:
+                    pred.lock.release()
+
+    def __iter__(self):
+        """
+        Yield the keys in ascending order without locking. The walk is
+        weakly consistent: keys added or erased meanwhile may or may not
+        show up, but no key shows up twice and the order is kept.
+
+        Running Time:
+            O(n)
+        """
+        x = self.head.next[0]
+        while(x is not None):
+            if(x.fully_linked and not x.marked):
+                yield x.key
+            x = x.next[0]
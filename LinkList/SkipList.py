@@ -1,172 +1,216 @@
 """
     A skip list implementation.
     Skip list allows search, add, erase operation in O(log(n)) time with high probability (w.h.p.).
+    Every key is stored in a single node that holds one forward pointer per level,
+    so walking a tower needs no extra node objects and no recursion.
 """
+import math
 import random
 
 class Node:
     """
     Attributes:
         key: the node's key
-        next: the next node
-        prev: the previous node
-        bottom: the bottom node in skip list (the node has same key in the level below)
+        next: the forward pointers, next[i] is the next node on level i
+        width: width[i] is how many bottom level steps next[i] spans
+               (a None link spans to one past the last node)
     """
-    def __init__(self, key):
+    __slots__ = ('key', 'next', 'width')
+
+    def __init__(self, key, level):
         """
         Create a node.
 
         Args:
             key: the node's key
-        
+            level: the number of levels the node is linked on
+
         Running Time:
-            O(1)
+            O(level)
         """
         self.key = key
-        self.next = None
-        self.prev = None
-        self.bottom = None
-    
-    def find(self, target):
-        """
-        Find the node whose next node has bigger key than target.
+        self.next = [None] * level
+        self.width = [1] * level
 
-        Args:
-            target: the bigger key
-        
-        Return:
-            The first node whose next node have the key that is bigger than target
-        
-        Running Time:
-            O(n)
-        """
-        if(self.next is not None and self.next.key <= target):
-            return self.next.find(target)
-        else:
-            return self
-        
-    def append(self, target):
+
+class Skiplist:
+    """
+    Attributes:
+        head: the head sentinel, its key is never compared,
+              it has one forward pointer per level in use
+        p: the probability that a tower grows one more level
+        max_level: the most levels a tower can have
+        rng: the random.Random used to draw tower heights
+        size: the number of keys
+    """
+    def __init__(self, p = 0.5, max_level = 32, seed = None, rng = None):
         """
-        Append a node with key of target to current node.
+        Create a Skiplist.
 
         Args:
-            target: the key of new node
-        
+            p: the probability that a tower grows one more level, 0 < p < 1
+            max_level: the most levels a tower can have,
+                       about log(n)/log(1/p) for n keys is enough
+            seed: seeds a private random.Random, for reproducible runs
+            rng: a random.Random like object to use instead (needs random())
+
         Running Time:
             O(1)
         """
-        # define two side
-        q = self.next
-        p = Node(target)
-        # connect left
-        self.next = p
-        p.prev = self
-        # connect right
-        p.next = q
-        if(q is not None):
-            q.prev = p
-        
-    def delete(self):
-        """
-        Delete the node next.
-        
+        if(not 0 < p < 1):
+            raise ValueError("p must be between 0 and 1")
+        if(max_level < 1):
+            raise ValueError("max_level must be at least 1")
+        self.p = p
+        self.max_level = max_level
+        self.rng = rng if rng is not None else random.Random(seed)
+        self._log_p = math.log(p)
+        self.head = Node(None, 1)
+        self.size = 0
+        # (added, seen) while add_sorted_batch runs, see _flush
+        self._pending = None
+
+    def __len__(self):
+        return self.size
+
+    def _random_level(self):
+        """
+        Draw a tower height from the geometric distribution
+        P(level > i) = p**i, capped at max_level, with a single random draw.
+
         Running Time:
             O(1)
         """
-        # define two side
-        p = self.prev
-        q = self.next
-        # connect
-        # if(p is not None):
-        p.next = q
-        if(q is not None):
-            q.prev = p
-        del self
-
-            
-    
-class Skiplist:
-    """
-    Attributes:
-        startList: the head node list
-    """
-    def __init__(self):
+        # inverse transform: 1 - u is in (0, 1], so the log is finite
+        level = 1 + int(math.log(1.0 - self.rng.random()) / self._log_p)
+        return level if level < self.max_level else self.max_level
+
+    def _find_update(self, target, inclusive = False):
         """
-        Create a Skiplist.
-        
+        Find, on every level, the last node whose key is less than target.
+
+        Args:
+            target: the key
+            inclusive: find the last node whose key is <= target instead
+
+        Return:
+            (update, ranks): update[i] is that node on level i and ranks[i]
+            its position (the head is 0, the first node is 1)
+
         Running Time:
-            O(1)
+            O(log(n)) w.h.p.
         """
-        self.startList = [Node(-1)]
+        update = [None] * len(self.head.next)
+        ranks = [0] * len(self.head.next)
+        x = self.head
+        pos = 0
+        for i in range(len(self.head.next) - 1, -1, -1):
+            nxt = x.next[i]
+            while(nxt is not None and (nxt.key < target or
+                                       (inclusive and nxt.key == target))):
+                pos += x.width[i]
+                x = nxt
+                nxt = x.next[i]
+            update[i] = x
+            ranks[i] = pos
+        return update, ranks
 
-    def search(self, target: int) -> bool:
+    def search(self, target) -> bool:
         """
         Query whether the node with target key exist.
 
         Args:
             target: the target key
-        
+
         Return:
             Whether the node with target key exist
-        
+
         Running Time:
             O(log(n)) w.h.p.
         """
-        p = self.startList[-1]
-        while(p is not None and p.key < target):
-            p = p.find(target)
-            if(p.key == target):
-                return True
-            else:
-                p = p.bottom
-        return False
+        x = self.head
+        for i in range(len(self.head.next) - 1, -1, -1):
+            nxt = x.next[i]
+            while(nxt is not None and nxt.key < target):
+                x = nxt
+                nxt = x.next[i]
+        x = x.next[0]
+        return x is not None and x.key == target
 
-    def add(self, num: int) -> None:
+    def add(self, num) -> None:
         """
         Add a node with key of num.
 
         Args:
             num: the key of the node
-        
+
         Running Time:
             O(log(n)) w.h.p.
         """
-        p = self.startList[-1]
-        s = []
-        while(p is not None and p.key < num):
-            p = p.find(num)
-            s.append(p)
-            if(p.key == num):
-                s.pop()
-                while(p is not None):
-                    s.append(p)
-                    p = p.bottom
-                break
-            else:
-                p = p.bottom
-        b = None
-        p = s.pop()
-        p.append(num)
-        p.next.bottom = b
-        b = p.next
-        while(random.choice([True, False])):
-            if(len(s) > 0):
-                p = s.pop()
-                p.append(num)
-                p.next.bottom = b
-                b = p.next
+        update, ranks = self._find_update(num)
+        self._add_found(update, ranks, num)
+
+    def _link(self, update, ranks, node):
+        """
+        Link node in after update[i] on each of its levels.
+
+        Args:
+            update, ranks: as returned by _find_update
+            node: the new node
+
+        Running Time:
+            O(log(n)) w.h.p.
+        """
+        level = len(node.next)
+        if(self._pending is not None):
+            if(level > len(self.head.next)):
+                # settle every level before the head grows, then start over
+                self._flush(update, len(update))
+                self._pending = ([0] * (self.max_level + 1), [0] * self.max_level)
             else:
-                start = Node(-1)
-                start.next = Node(num)
-                start.bottom = self.startList[-1]
-                
-                start.next.bottom = b
-                start.next.prev = start
-                self.startList.append(start)
-
-                b = start.next        
-                
-    def erase(self, num: int) -> bool:
+                self._flush(update, level)
+        # grow the head when the new tower is the tallest so far,
+        # a new head link spans to one past the last node
+        while(len(self.head.next) < level):
+            self.head.next.append(None)
+            self.head.width.append(self.size + 1)
+            update.append(self.head)
+            ranks.append(0)
+        for i in range(level):
+            node.next[i] = update[i].next[i]
+            update[i].next[i] = node
+            # split the span of update[i] around the new node
+            node.width[i] = update[i].width[i] - (ranks[0] - ranks[i])
+            update[i].width[i] = ranks[0] - ranks[i] + 1
+        # links above the new tower now jump over one more node;
+        # in a batch that is deferred until the finger moves on
+        if(self._pending is not None):
+            self._pending[0][level] += 1
+        else:
+            for i in range(level, len(update)):
+                update[i].width[i] += 1
+        self.size += 1
+
+    def _flush(self, update, top):
+        """
+        Apply the deferred width increments of a batch to the fingers
+        update[i] of the levels i < top. added[h] counts the towers of
+        height h linked in the batch, each of them adds one to the span
+        of the finger on every level i >= h; seen[i] is how many of
+        those level i has been given so far.
+
+        Running Time:
+            O(top)
+        """
+        added, seen = self._pending
+        c = 0
+        for i in range(top):
+            c += added[i]
+            if(c != seen[i]):
+                update[i].width[i] += c - seen[i]
+                seen[i] = c
+
+    def erase(self, num) -> bool:
         """
         Delete the node with key of num.
 
@@ -175,19 +219,258 @@ class Skiplist:
 
         Return:
             Whether delete success
-        
+
         Running Time:
             O(log(n)) w.h.p.
         """
-        p = self.startList[-1]
-        while(p is not None and p.key < num):
-            p = p.find(num)
-            if(p.key == num):
-                while(p is not None):
-                    q = p
-                    p = p.bottom
-                    q.delete()
-                return True
+        update, _ = self._find_update(num)
+        x = update[0].next[0]
+        if(x is None or x.key != num):
+            return False
+        self._unlink(update, x)
+        return True
+
+    def _unlink(self, update, x):
+        """
+        Unlink node x, which follows update[i] on every level it has.
+
+        Running Time:
+            O(log(n)) w.h.p.
+        """
+        for i in range(len(update)):
+            if(i < len(x.next)):
+                update[i].width[i] += x.width[i] - 1
+                update[i].next[i] = x.next[i]
             else:
-                p = p.bottom
-        return False
+                update[i].width[i] -= 1
+        self.size -= 1
+        self._trim()
+
+    def _trim(self):
+        # drop empty levels at the top
+        while(len(self.head.next) > 1 and self.head.next[-1] is None):
+            self.head.next.pop()
+            self.head.width.pop()
+
+    @classmethod
+    def from_sorted(cls, iterable, **kwargs):
+        """
+        Build a Skiplist from keys in non-decreasing order in one pass.
+
+        Args:
+            iterable: the keys, in non-decreasing order
+            kwargs: passed to the constructor (p, max_level, seed, rng)
+
+        Running Time:
+            O(n) expected
+        """
+        skiplist = cls(**kwargs)
+        skiplist._append_sorted(iterable, Node)
+        return skiplist
+
+    def _append_sorted(self, items, make_node):
+        """
+        Link the nodes made from sorted items into this empty list,
+        left to right, keeping the last node of every level at hand.
+
+        Args:
+            items: the sorted items
+            make_node: make_node(item, level) returns the node for an item
+
+        Running Time:
+            O(n) expected
+        """
+        last = [self.head]
+        last_pos = [0]
+        pos = 0
+        prev = None
+        for item in items:
+            node = make_node(item, self._random_level())
+            if(pos > 0 and node.key < prev):
+                raise ValueError("keys are not sorted")
+            prev = node.key
+            pos += 1
+            level = len(node.next)
+            while(len(last) < level):
+                self.head.next.append(None)
+                self.head.width.append(0)
+                last.append(self.head)
+                last_pos.append(0)
+            for i in range(level):
+                last[i].next[i] = node
+                last[i].width[i] = pos - last_pos[i]
+                last[i] = node
+                last_pos[i] = pos
+        self.size = pos
+        # the last link of every level spans to one past the last node
+        for i in range(len(last)):
+            last[i].width[i] = pos + 1 - last_pos[i]
+
+    def _find_update_from(self, update, ranks, target, inclusive = False):
+        """
+        Like _find_update, but start from the fingers left by the previous
+        search for a smaller key: climb only as high as needed to skip
+        ahead, then descend.
+
+        Running Time:
+            O(log(d)) expected, d is the distance moved
+        """
+        top = len(self.head.next)
+        # fingers are only valid for an unchanged height
+        if(update is None or len(update) != top):
+            return self._find_update(target, inclusive)
+        i = 0
+        while(i + 1 < top and update[i + 1].next[i + 1] is not None and
+              (update[i + 1].next[i + 1].key < target or
+               (inclusive and update[i + 1].next[i + 1].key == target))):
+            i += 1
+        if(self._pending is not None):
+            # the fingers about to move must carry their spans in full
+            self._flush(update, i + 1)
+        x = update[i]
+        pos = ranks[i]
+        for lvl in range(i, -1, -1):
+            # the old finger on this level may already be further right
+            if(ranks[lvl] > pos):
+                x = update[lvl]
+                pos = ranks[lvl]
+            nxt = x.next[lvl]
+            while(nxt is not None and (nxt.key < target or
+                                       (inclusive and nxt.key == target))):
+                pos += x.width[lvl]
+                x = nxt
+                nxt = x.next[lvl]
+            update[lvl] = x
+            ranks[lvl] = pos
+        return update, ranks
+
+    def _add_found(self, update, ranks, item):
+        """
+        Add item at the place found by _find_update.
+
+        Return:
+            The new node, or None if nothing was linked
+
+        Running Time:
+            O(log(n)) w.h.p.
+        """
+        node = Node(item, self._random_level())
+        self._link(update, ranks, node)
+        return node
+
+    def _batch_key(self, item):
+        return item
+
+    def add_sorted_batch(self, iterable) -> None:
+        """
+        Add keys given in non-decreasing order. Each search starts from
+        the fingers of the previous key instead of from the top of the head,
+        and the spans that a new node lengthens above its tower are only
+        updated when the finger of that level moves on, so a new node
+        costs O(1) expected besides its search.
+
+        Args:
+            iterable: the keys, in non-decreasing order
+
+        Running Time:
+            O(m*log(n/m + 1) + m) expected, which is O(n + m)
+        """
+        update = ranks = None
+        prev = None
+        first = True
+        self._pending = ([0] * (self.max_level + 1), [0] * self.max_level)
+        try:
+            for item in iterable:
+                key = self._batch_key(item)
+                if(not first and key < prev):
+                    raise ValueError("keys are not sorted")
+                first = False
+                prev = key
+                # the fingers stay in front of the new node, which is
+                # still before every later key, so they stay valid
+                update, ranks = self._find_update_from(update, ranks, key)
+                self._add_found(update, ranks, item)
+        finally:
+            # a failed batch leaves the keys added so far, with right spans
+            if(update is not None):
+                self._flush(update, len(update))
+            self._pending = None
+
+    def __iter__(self):
+        """
+        Yield every key in ascending order, walking the bottom level.
+
+        Running Time:
+            O(n)
+        """
+        x = self.head.next[0]
+        while(x is not None):
+            yield x.key
+            x = x.next[0]
+
+    def rank(self, target) -> int:
+        """
+        Count the keys that are less than target.
+
+        Running Time:
+            O(log(n)) w.h.p.
+        """
+        x = self.head
+        pos = 0
+        for i in range(len(self.head.next) - 1, -1, -1):
+            nxt = x.next[i]
+            while(nxt is not None and nxt.key < target):
+                pos += x.width[i]
+                x = nxt
+                nxt = x.next[i]
+        return pos
+
+    def _select_node(self, i):
+        """
+        Find the node of the i-th smallest key (0-indexed).
+
+        Running Time:
+            O(log(n)) w.h.p.
+        """
+        if(i < 0):
+            i += self.size
+        if(i < 0 or i >= self.size):
+            raise IndexError("Skiplist index out of range")
+        x = self.head
+        pos = 0
+        # walk as far as possible without passing position i + 1
+        for lvl in range(len(self.head.next) - 1, -1, -1):
+            while(x.next[lvl] is not None and pos + x.width[lvl] <= i + 1):
+                pos += x.width[lvl]
+                x = x.next[lvl]
+        return x
+
+    def select(self, i):
+        """
+        Return the i-th smallest key (0-indexed, negative i counts from the end).
+
+        Running Time:
+            O(log(n)) w.h.p.
+        """
+        return self._select_node(i).key
+
+    def __getitem__(self, index):
+        """
+        Return the key at index, or a list of keys for a slice.
+
+        Running Time:
+            O(log(n)) w.h.p., plus O(m) for a slice that spans m positions.
+        """
+        if(not isinstance(index, slice)):
+            return self.select(index)
+        positions = range(*index.indices(self.size))
+        if(len(positions) == 0):
+            return []
+        lo = min(positions[0], positions[-1])
+        hi = max(positions[0], positions[-1])
+        keys = []
+        x = self._select_node(lo)
+        for _ in range(hi - lo + 1):
+            keys.append(x.key)
+            x = x.next[0]
+        return [keys[j - lo] for j in positions]
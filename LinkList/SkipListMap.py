@@ -0,0 +1,316 @@
+"""
+    A skip list map implementation.
+    An ordered key -> value map on top of Skiplist, with a configurable
+    policy for duplicate keys and lazy range iterators.
+"""
+from SkipList import Node, Skiplist
+
+# marks a missing default argument, so that None can be a real default
+_missing = object()
+
+
+class MapNode(Node):
+    """
+    Attributes:
+        value: the node's value
+        prev: the previous node on the bottom level (None for the first node)
+    """
+    __slots__ = ('value', 'prev')
+
+    def __init__(self, key, level, value = None):
+        """
+        Create a node.
+
+        Running Time:
+            O(level)
+        """
+        super().__init__(key, level)
+        self.value = value
+        self.prev = None
+
+
+class SkipListMap(Skiplist):
+    """
+    An ordered map. m[key] reads and writes values by key; use select
+    for positional access.
+
+    Attributes:
+        policy: 'upsert' keeps one entry per key and overwrites its value,
+                'multiset' keeps every entry, in insertion order per key
+    """
+    UPSERT = 'upsert'
+    MULTISET = 'multiset'
+
+    def __init__(self, policy = UPSERT, **kwargs):
+        """
+        Create a SkipListMap.
+
+        Args:
+            policy: SkipListMap.UPSERT or SkipListMap.MULTISET
+            kwargs: passed to Skiplist (p, max_level, seed, rng)
+
+        Running Time:
+            O(1)
+        """
+        if(policy not in (SkipListMap.UPSERT, SkipListMap.MULTISET)):
+            raise ValueError("unknown duplicate policy %r" % (policy,))
+        super().__init__(**kwargs)
+        self.policy = policy
+
+    def _link(self, update, ranks, node):
+        super()._link(update, ranks, node)
+        node.prev = update[0] if update[0] is not self.head else None
+        if(node.next[0] is not None):
+            node.next[0].prev = node
+
+    def _unlink(self, update, x):
+        if(x.next[0] is not None):
+            x.next[0].prev = x.prev
+        super()._unlink(update, x)
+
+    @classmethod
+    def from_sorted(cls, items, policy = UPSERT, **kwargs):
+        """
+        Build a SkipListMap from (key, value) pairs in non-decreasing key
+        order in one pass. Under the upsert policy the last value of a
+        repeated key wins.
+
+        Running Time:
+            O(n) expected
+        """
+        m = cls(policy, **kwargs)
+        if(policy == SkipListMap.UPSERT):
+            items = SkipListMap._last_of_runs(items)
+        m._append_sorted(items, lambda item, level: MapNode(item[0], level, item[1]))
+        prev = None
+        x = m.head.next[0]
+        while(x is not None):
+            x.prev = prev
+            prev = x
+            x = x.next[0]
+        return m
+
+    @staticmethod
+    def _last_of_runs(items):
+        # keeps the last pair of every run of equal keys
+        pending = None
+        for item in items:
+            if(pending is not None and pending[0] != item[0]):
+                yield pending
+            pending = item
+        if(pending is not None):
+            yield pending
+
+    def _batch_key(self, item):
+        return item[0]
+
+    def _add_found(self, update, ranks, item):
+        # item is a (key, value) pair from add_sorted_batch
+        key, value = item
+        x = update[0].next[0]
+        if(x is not None and x.key == key):
+            if(self.policy == SkipListMap.UPSERT):
+                x.value = value
+                return None
+            # multiset entries go after the equal keys; the fingers may
+            # move past them, every later key is at least key
+            update, ranks = self._find_update_from(update, ranks, key, True)
+        node = MapNode(key, self._random_level(), value)
+        self._link(update, ranks, node)
+        return node
+
+    def _first(self, key):
+        # the first node with key, or None
+        x = self._find_update(key)[0][0].next[0]
+        return x if x is not None and x.key == key else None
+
+    def insert(self, key, value = None):
+        """
+        Insert an entry. Under the upsert policy an existing entry
+        with the same key gets the new value instead.
+
+        Return:
+            The node that holds the entry
+
+        Running Time:
+            O(log(n)) w.h.p.
+        """
+        # multiset entries go after the equal keys, upsert looks for the key
+        update, ranks = self._find_update(key, self.policy == SkipListMap.MULTISET)
+        if(self.policy == SkipListMap.UPSERT):
+            x = update[0].next[0]
+            if(x is not None and x.key == key):
+                x.value = value
+                return x
+        node = MapNode(key, self._random_level(), value)
+        self._link(update, ranks, node)
+        return node
+
+    def add(self, num) -> None:
+        self.insert(num)
+
+    def __setitem__(self, key, value):
+        self.insert(key, value)
+
+    def __getitem__(self, key):
+        x = self._first(key)
+        if(x is None):
+            raise KeyError(key)
+        return x.value
+
+    def __delitem__(self, key):
+        """Delete every entry with key."""
+        if(self.delete_range(key, key) == 0):
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return self.search(key)
+
+    def get(self, key, default = None):
+        """
+        Return the value of the first entry with key, or default.
+
+        Running Time:
+            O(log(n)) w.h.p.
+        """
+        x = self._first(key)
+        return default if x is None else x.value
+
+    def get_all(self, key):
+        """
+        Return the values of every entry with key, in insertion order.
+
+        Running Time:
+            O(log(n) + k) w.h.p., k is the number of entries with key.
+        """
+        return [v for _, v in self.irange(key, key)]
+
+    def pop(self, key, default = _missing):
+        """
+        Remove the first entry with key and return its value.
+
+        Raises:
+            KeyError: if there is no entry and no default is given.
+
+        Running Time:
+            O(log(n)) w.h.p.
+        """
+        update, _ = self._find_update(key)
+        x = update[0].next[0]
+        if(x is None or x.key != key):
+            if(default is _missing):
+                raise KeyError(key)
+            return default
+        self._unlink(update, x)
+        return x.value
+
+    def items(self):
+        """
+        Yield the (key, value) entries in ascending key order.
+
+        Running Time:
+            O(n)
+        """
+        x = self.head.next[0]
+        while(x is not None):
+            yield x.key, x.value
+            x = x.next[0]
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        for _, v in self.items():
+            yield v
+
+    def _last(self):
+        return self._select_node(-1) if self.size > 0 else None
+
+    def __reversed__(self):
+        """
+        Yield every key in descending order, walking the bottom level back.
+
+        Running Time:
+            O(n)
+        """
+        x = self._last()
+        while(x is not None):
+            yield x.key
+            x = x.prev
+
+    def irange(self, lo = None, hi = None, inclusive = (True, True), reverse = False):
+        """
+        Yield the (key, value) entries with key between lo and hi.
+
+        Args:
+            lo: the lower bound, None for no lower bound
+            hi: the upper bound, None for no upper bound
+            inclusive: a pair of booleans, whether lo and hi are included
+            reverse: yield in descending order
+
+        Running Time:
+            O(log(n) + k) w.h.p., k is the number of entries yielded.
+        """
+        if(not reverse):
+            if(lo is None):
+                x = self.head.next[0]
+            else:
+                x = self._find_update(lo, not inclusive[0])[0][0].next[0]
+            while(x is not None):
+                if(hi is not None and (hi < x.key or (not inclusive[1] and x.key == hi))):
+                    return
+                yield x.key, x.value
+                x = x.next[0]
+        else:
+            if(hi is None):
+                x = self._last()
+            else:
+                x = self._find_update(hi, inclusive[1])[0][0]
+                x = None if x is self.head else x
+            while(x is not None):
+                if(lo is not None and (x.key < lo or (not inclusive[0] and x.key == lo))):
+                    return
+                yield x.key, x.value
+                x = x.prev
+
+    def delete_range(self, lo, hi, inclusive = (True, True)):
+        """
+        Delete every entry with key between lo and hi.
+
+        Each level is cut once around the range, so only the
+        links into the deleted nodes are touched.
+
+        Return:
+            The number of entries deleted
+
+        Running Time:
+            O(log(n) + k) w.h.p., k is the number of entries deleted.
+        """
+        def in_range(x):
+            return x is not None and (x.key < hi or (inclusive[1] and x.key == hi))
+
+        update, _ = self._find_update(lo, not inclusive[0])
+        # count the entries to delete on the bottom level
+        k = 0
+        x = update[0].next[0]
+        while(in_range(x)):
+            k += 1
+            x = x.next[0]
+        if(k == 0):
+            return 0
+        after = x
+        # the link from update[i] now reaches the first node after the
+        # range on level i, and spans k fewer bottom level steps
+        for i in range(len(update)):
+            w = update[i].width[i]
+            x = update[i].next[i]
+            while(in_range(x)):
+                w += x.width[i]
+                x = x.next[i]
+            update[i].next[i] = x
+            update[i].width[i] = w - k
+        if(after is not None):
+            after.prev = update[0] if update[0] is not self.head else None
+        self.size -= k
+        self._trim()
+        return k
@@ -0,0 +1,270 @@
+"""
+    A skip list with snapshot reads (multiversion concurrency control).
+    snapshot() returns a handle that iterates the keys as they were when it
+    was taken, while add and erase keep going. Only the bottom level is
+    versioned: before a write changes a bottom level link that an open
+    snapshot may still follow, the old link is kept in the node's history,
+    tagged with the version of the write. Erased nodes stay reachable
+    through those old links, and are dropped once the last snapshot that
+    can see them is closed.
+    One writer at a time; any number of threads may read snapshots.
+"""
+import collections
+import threading
+import weakref
+
+from SkipList import Node, Skiplist
+
+
+class VersionedNode(Node):
+    """
+    Attributes:
+        created: the version of the write that linked the node
+        erased: the version of the write that unlinked it, None while linked
+        history: (version, old) pairs in ascending version order, next[0]
+                 was old until the write with that version changed it
+    """
+    __slots__ = ('created', 'erased', 'history')
+
+    def __init__(self, key, level):
+        """
+        Create a node.
+
+        Running Time:
+            O(level)
+        """
+        super().__init__(key, level)
+        self.created = 0
+        self.erased = None
+        self.history = []
+
+    def next_at(self, version):
+        """
+        Return the bottom level link as it was at version.
+
+        Running Time:
+            O(h), h is the number of kept old links of the node
+        """
+        # read the link before the history: a writer adds the
+        # old link to the history before it changes next[0]
+        nxt = self.next[0]
+        for w, old in self.history:
+            if(w > version):
+                return old
+        return nxt
+
+
+class Snapshot:
+    """
+    A point in time view of a VersionedSkiplist. Close it (or use it in a
+    with block) when done, so that the old versions it holds can be dropped.
+
+    Attributes:
+        version: the version of the list the snapshot sees
+        size: the number of keys at that version
+    """
+    def __init__(self, skiplist, version):
+        self._skiplist = skiplist
+        self.version = version
+        self.size = skiplist.size
+        # releases the version even if the handle is dropped without close
+        self._finalizer = weakref.finalize(self, skiplist._release, version)
+
+    def __len__(self):
+        return self.size
+
+    def close(self):
+        """
+        Release the snapshot. It must not be read afterwards.
+
+        Running Time:
+            O(s + g), s is the number of open snapshots and g the
+            number of old links that can be dropped.
+        """
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _walk(self, x):
+        # yields the nodes after x at this version, in ascending order
+        v = self.version
+        x = x.next_at(v)
+        while(x is not None):
+            yield x
+            x = x.next_at(v)
+
+    def __iter__(self):
+        """
+        Yield every key in ascending order, as of the snapshot. Takes no lock.
+
+        Running Time:
+            O(n + h), h is the number of old links kept
+        """
+        if(not self._finalizer.alive):
+            raise ValueError("snapshot is closed")
+        for x in self._walk(self._skiplist.head):
+            yield x.key
+
+    def irange(self, lo = None, hi = None, inclusive = (True, True)):
+        """
+        Yield the keys between lo and hi in ascending order, as of the snapshot.
+
+        Args:
+            lo: the lower bound, None for no lower bound
+            hi: the upper bound, None for no upper bound
+            inclusive: a pair of booleans, whether lo and hi are included
+
+        Running Time:
+            O(log(n) + k) w.h.p. when few keys before lo changed since
+            the snapshot was taken, k is the number of keys passed over.
+        """
+        if(not self._finalizer.alive):
+            raise ValueError("snapshot is closed")
+        start = self._skiplist.head
+        if(lo is not None):
+            start = self._skiplist._start_node(lo, self.version)
+        for x in self._walk(start):
+            if(lo is not None and (x.key < lo or (not inclusive[0] and x.key == lo))):
+                continue
+            if(hi is not None and (hi < x.key or (not inclusive[1] and x.key == hi))):
+                return
+            yield x.key
+
+    def __contains__(self, key):
+        for _ in self.irange(key, key):
+            return True
+        return False
+
+
+class VersionedSkiplist(Skiplist):
+    """
+    A Skiplist with snapshot(). Everything else reads the current version.
+
+    Attributes:
+        version: the number of writes so far
+    """
+    def __init__(self, **kwargs):
+        """
+        Create a VersionedSkiplist.
+
+        Args:
+            kwargs: passed to Skiplist (p, max_level, seed, rng)
+
+        Running Time:
+            O(1)
+        """
+        super().__init__(**kwargs)
+        self.head = VersionedNode(None, 1)
+        self.version = 0
+        # open snapshot version -> number of open snapshots at it
+        self._snapshots = {}
+        # (version, node) for every kept old link, in version order
+        self._kept = collections.deque()
+        # held by a write and by opening and closing a snapshot, never by reads
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_sorted(cls, iterable, **kwargs):
+        """
+        Build a VersionedSkiplist from keys in non-decreasing order in one pass.
+
+        Running Time:
+            O(n) expected
+        """
+        skiplist = cls(**kwargs)
+        skiplist._append_sorted(iterable, VersionedNode)
+        return skiplist
+
+    def _add_found(self, update, ranks, item):
+        node = VersionedNode(item, self._random_level())
+        self._link(update, ranks, node)
+        return node
+
+    def _keep(self, x, w):
+        # keeps x's bottom level link before the write w changes it,
+        # if an open snapshot may still follow it
+        if(self._snapshots):
+            x.history.append((w, x.next[0]))
+            self._kept.append((w, x))
+
+    def _link(self, update, ranks, node):
+        with self._lock:
+            w = self.version + 1
+            node.created = w
+            self._keep(update[0], w)
+            super()._link(update, ranks, node)
+            self.version = w
+
+    def _unlink(self, update, x):
+        # x keeps its links, so snapshots that reach it can go on
+        with self._lock:
+            w = self.version + 1
+            # set before the unlink, so a reader that still reaches
+            # x on a level above knows it is gone from version w on
+            x.erased = w
+            self._keep(update[0], w)
+            super()._unlink(update, x)
+            self.version = w
+
+    def snapshot(self):
+        """
+        Return a Snapshot of the current version.
+
+        Running Time:
+            O(1)
+        """
+        with self._lock:
+            v = self.version
+            self._snapshots[v] = self._snapshots.get(v, 0) + 1
+            return Snapshot(self, v)
+
+    def _release(self, v):
+        """
+        Close a snapshot at version v, and drop the old links that
+        no open snapshot can follow any more.
+
+        Running Time:
+            O(s + g), s is the number of open snapshots and g the
+            number of old links dropped.
+        """
+        with self._lock:
+            if(self._snapshots[v] == 1):
+                del self._snapshots[v]
+            else:
+                self._snapshots[v] -= 1
+            # a snapshot at v only follows old links of writes after v
+            oldest = min(self._snapshots) if self._snapshots else self.version
+            while(self._kept and self._kept[0][0] <= oldest):
+                _, x = self._kept.popleft()
+                if(x.history and x.history[0][0] <= oldest):
+                    # a new list, so a reader holding the old one is not disturbed
+                    x.history = [e for e in x.history if e[0] > oldest]
+
+    def _start_node(self, key, version):
+        """
+        Find a node with key less than key that was linked at version,
+        close to the last one, to start a scan of that version from.
+        Takes no lock: a writer may link, unlink or drop levels meanwhile.
+
+        Running Time:
+            O(log(n)) w.h.p.
+        """
+        # copy the head's links once, the head can lose levels under us;
+        # other nodes never change their height, and the links of an
+        # unlinked node still lead to larger keys
+        heads = list(self.head.next)
+        best = self.head
+        x = None
+        for i in range(len(heads) - 1, -1, -1):
+            nxt = heads[i] if x is None else x.next[i]
+            while(nxt is not None and nxt.key < key):
+                x = nxt
+                # keys only grow along the walk, so the last fit is the closest
+                if(x.created <= version and (x.erased is None or version < x.erased)):
+                    best = x
+                nxt = x.next[i]
+        return best
@@ -0,0 +1,83 @@
+"""
+    Throughput against thread count for ConcurrentSkiplist, next to a
+    Skiplist serialized behind one global lock, for a read-heavy and a
+    write-heavy mix. Under the GIL pure Python threads do not run in
+    parallel, so this shows the cost of the fine grained locking and
+    how throughput holds up as threads are added.
+
+    Usage: python bench_concurrent_skiplist.py [ops_per_thread] [keys]
+"""
+import random
+import sys
+import threading
+import time
+
+from ConcurrentSkipList import ConcurrentSkiplist
+from SkipList import Skiplist
+
+THREADS = (1, 2, 4, 8)
+MIXES = {'read-heavy': 0.9, 'write-heavy': 0.2}
+
+
+class LockedSkiplist:
+    """A Skiplist with every call behind one lock."""
+    def __init__(self, seed = None):
+        self.s = Skiplist(seed = seed)
+        self.lock = threading.Lock()
+
+    def search(self, k):
+        with self.lock:
+            return self.s.search(k)
+
+    def add(self, k):
+        with self.lock:
+            if(self.s.search(k)):
+                return False
+            self.s.add(k)
+            return True
+
+    def erase(self, k):
+        with self.lock:
+            return self.s.erase(k)
+
+
+def worker(s, seed, ops, keys, reads):
+    rng = random.Random(seed)
+    for _ in range(ops):
+        k = rng.randrange(keys)
+        r = rng.random()
+        if(r < reads):
+            s.search(k)
+        elif(r < reads + (1 - reads) / 2):
+            s.add(k)
+        else:
+            s.erase(k)
+
+
+def throughput(make, threads, ops, keys, reads):
+    s = make()
+    for k in range(0, keys, 2):
+        s.add(k)
+    workers = [threading.Thread(target = worker, args = (s, i, ops, keys, reads))
+               for i in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return threads * ops / (time.perf_counter() - start)
+
+
+def main(ops, keys):
+    print("%-12s %-20s" % ("mix", "list") + "".join("%12s" % ("%d thr" % t) for t in THREADS))
+    for mix, reads in MIXES.items():
+        for name, make in (("ConcurrentSkiplist", lambda: ConcurrentSkiplist(seed = 1)),
+                           ("locked Skiplist", lambda: LockedSkiplist(seed = 1))):
+            print("%-12s %-20s" % (mix, name) +
+                  "".join("%12.0f" % throughput(make, t, ops, keys, reads) for t in THREADS))
+    print("(ops/sec over all threads)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 10000)
@@ -0,0 +1,64 @@
+"""
+    Benchmark for Skiplist level generation:
+    add latency (mean and tail percentiles) with the capped geometric
+    level drawn from one seeded RNG call, against the earlier uncapped
+    coin flip loop over random.choice([True, False]). Every run is
+    repeated with a few seeds to show how stable the tail is.
+
+    Usage: python bench_levels.py [n] [runs]
+"""
+import gc
+import random
+import sys
+import time
+
+from SkipList import Skiplist
+
+
+class CoinFlipSkiplist(Skiplist):
+    """A Skiplist that draws levels the earlier way."""
+    def _random_level(self):
+        level = 1
+        while(random.choice([True, False])):
+            level += 1
+        return level
+
+
+def add_latencies(s, keys):
+    clock = time.perf_counter_ns
+    latencies = []
+    # collector pauses would swamp the tail
+    gc.disable()
+    try:
+        for k in keys:
+            start = clock()
+            s.add(k)
+            latencies.append(clock() - start)
+    finally:
+        gc.enable()
+    latencies.sort()
+    return latencies
+
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q / 100 * len(sorted_values)))]
+
+
+def main(n, runs):
+    keys = random.Random(1).sample(range(n * 10), n)
+    print("%-18s %5s %9s %9s %9s %9s %9s %7s" % ("levels", "seed", "mean ns", "p50 ns",
+                                               "p99 ns", "p99.9 ns", "max ns", "height"))
+    for name, make in (("geometric capped", lambda seed: Skiplist(seed = seed)),
+                       ("coin flip", lambda seed: CoinFlipSkiplist(seed = seed))):
+        for seed in range(runs):
+            random.seed(seed)
+            s = make(seed)
+            lat = add_latencies(s, keys)
+            print("%-18s %5d %9.0f %9d %9d %9d %9d %7d" % (
+                name, seed, sum(lat) / n, percentile(lat, 50), percentile(lat, 99),
+                percentile(lat, 99.9), lat[-1], len(s.head.next)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 3)
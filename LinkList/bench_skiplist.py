@@ -0,0 +1,160 @@
+"""
+    Benchmark for the Skiplist node layout:
+    memory per key and search/add/erase ops/sec of Skiplist (one node per
+    key with an array of forward pointers) against TowerSkiplist, a copy
+    of the earlier code as it was: one linked node per key and level,
+    a recursive find and levels from coin flips.
+
+    Usage: python bench_skiplist.py [n]
+"""
+import random
+import sys
+import time
+import tracemalloc
+
+from SkipList import Skiplist
+
+
+class TowerNode:
+    """A node of one level of a tower (the earlier layout)."""
+    def __init__(self, key):
+        self.key = key
+        self.next = None
+        self.prev = None
+        self.bottom = None
+
+    def find(self, target):
+        # recursive, one frame per node passed on this level
+        if(self.next is not None and self.next.key <= target):
+            return self.next.find(target)
+        else:
+            return self
+
+    def append(self, target):
+        q = self.next
+        p = TowerNode(target)
+        self.next = p
+        p.prev = self
+        p.next = q
+        if(q is not None):
+            q.prev = p
+
+    def delete(self):
+        p = self.prev
+        q = self.next
+        p.next = q
+        if(q is not None):
+            q.prev = p
+        del self
+
+
+class TowerSkiplist:
+    """
+    The earlier Skiplist as it was: recursive find, coin flips with
+    random.choice([True, False]) on the global random module, and a head
+    key of -1 (so keys must be larger). A long run on one level can
+    raise RecursionError.
+    """
+    def __init__(self):
+        self.startList = [TowerNode(-1)]
+
+    def search(self, target):
+        p = self.startList[-1]
+        while(p is not None and p.key < target):
+            p = p.find(target)
+            if(p.key == target):
+                return True
+            else:
+                p = p.bottom
+        return False
+
+    def add(self, num):
+        p = self.startList[-1]
+        s = []
+        while(p is not None and p.key < num):
+            p = p.find(num)
+            s.append(p)
+            if(p.key == num):
+                s.pop()
+                while(p is not None):
+                    s.append(p)
+                    p = p.bottom
+                break
+            else:
+                p = p.bottom
+        b = None
+        p = s.pop()
+        p.append(num)
+        p.next.bottom = b
+        b = p.next
+        while(random.choice([True, False])):
+            if(len(s) > 0):
+                p = s.pop()
+                p.append(num)
+                p.next.bottom = b
+                b = p.next
+            else:
+                start = TowerNode(-1)
+                start.next = TowerNode(num)
+                start.bottom = self.startList[-1]
+                start.next.bottom = b
+                start.next.prev = start
+                self.startList.append(start)
+                b = start.next
+
+    def erase(self, num):
+        p = self.startList[-1]
+        while(p is not None and p.key < num):
+            p = p.find(num)
+            if(p.key == num):
+                while(p is not None):
+                    q = p
+                    p = p.bottom
+                    q.delete()
+                return True
+            else:
+                p = p.bottom
+        return False
+
+
+def bytes_per_key(make, keys):
+    tracemalloc.start()
+    s = make()
+    for k in keys:
+        s.add(k)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return used / len(keys)
+
+
+def ops_per_sec(f, keys):
+    start = time.perf_counter()
+    for k in keys:
+        f(k)
+    return len(keys) / (time.perf_counter() - start)
+
+
+def main(n):
+    rng = random.Random(1)
+    keys = rng.sample(range(n * 10), n)
+    print("%-14s %10s %14s %14s %14s" % ("layout", "bytes/key", "add ops/s",
+                                         "search ops/s", "erase ops/s"))
+    for name, make in (("Skiplist", lambda: Skiplist(seed = 1)),
+                       ("TowerSkiplist", TowerSkiplist)):
+        try:
+            # TowerSkiplist draws its levels from the global random module
+            random.seed(1)
+            memory = bytes_per_key(make, keys)
+            random.seed(1)
+            s = make()
+            add = ops_per_sec(s.add, keys)
+            search = ops_per_sec(s.search, keys)
+            erase = ops_per_sec(s.erase, keys)
+        except RecursionError:
+            print("%-14s hit RecursionError, try a smaller n" % name)
+            continue
+        print("%-14s %10.1f %14.0f %14.0f %14.0f" % (name, memory, add, search, erase))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
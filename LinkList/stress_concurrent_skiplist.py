@@ -0,0 +1,87 @@
+"""
+    Multi-threaded stress test for ConcurrentSkiplist.
+    Threads add, erase and search a small key range at random, with a
+    tiny switch interval so that threads interleave inside operations.
+    Afterwards it checks that:
+    1. for every key, the successful adds minus the successful erases
+       is 0 or 1 and matches whether the key is in the list;
+    2. every level is sorted and holds no duplicate keys;
+    3. no marked or half linked node is reachable;
+    4. every tower is linked on all of its levels.
+    Exits with an AssertionError on the first violation.
+
+    Usage: python stress_concurrent_skiplist.py [threads] [ops_per_thread] [keys]
+"""
+import random
+import sys
+import threading
+
+from ConcurrentSkipList import ConcurrentSkiplist
+
+
+def worker(s, seed, ops, keys, net):
+    rng = random.Random(seed)
+    for _ in range(ops):
+        k = rng.randrange(keys)
+        r = rng.random()
+        if(r < 0.4):
+            if(s.add(k)):
+                net[k] += 1
+        elif(r < 0.8):
+            if(s.erase(k)):
+                net[k] -= 1
+        else:
+            s.search(k)
+
+
+def check(s, nets, keys):
+    total = [sum(net[k] for net in nets) for k in range(keys)]
+    present = set(s)
+    for k in range(keys):
+        assert total[k] in (0, 1), (k, total[k])
+        assert (total[k] == 1) == (k in present), k
+        assert s.search(k) == (k in present), k
+    towers = {}
+    for level in range(s.max_level):
+        x = s.head.next[level]
+        last = None
+        while(x is not None):
+            assert not x.marked and x.fully_linked, x.key
+            assert last is None or last < x.key, (level, last, x.key)
+            if(level == 0):
+                towers[x.key] = x
+            else:
+                assert towers.get(x.key) is x, (level, x.key)
+            last = x.key
+            x = x.next[level]
+    for k, x in towers.items():
+        for level in range(len(x.next)):
+            # every level of the tower is reachable on that level
+            y = s.head.next[level]
+            while(y is not None and y.key < k):
+                y = y.next[level]
+            assert y is x, (k, level)
+
+
+def main(threads, ops, keys):
+    old = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    try:
+        s = ConcurrentSkiplist(seed = 1)
+        nets = [[0] * keys for _ in range(threads)]
+        workers = [threading.Thread(target = worker, args = (s, i, ops, keys, nets[i]))
+                   for i in range(threads)]
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+    finally:
+        sys.setswitchinterval(old)
+    check(s, nets, keys)
+    print("ok: %d threads x %d ops on %d keys, %d keys left" % (threads, ops, keys, len(list(s))))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 8,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 20000,
+         int(sys.argv[3]) if len(sys.argv) > 3 else 200)
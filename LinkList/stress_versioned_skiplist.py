@@ -0,0 +1,102 @@
+"""
+    Multi-threaded stress test for VersionedSkiplist snapshot reads.
+    One writer thread adds and erases random keys and now and then takes a
+    snapshot, together with a copy of the keys it holds at that moment.
+    Reader threads meanwhile iterate those snapshots, scan random ranges
+    with irange and probe keys with in, with a tiny switch interval so
+    that reads interleave with the writer inside its operations.
+    Every read must match the copy taken with the snapshot.
+    Exits with an AssertionError on the first mismatch.
+
+    Usage: python stress_versioned_skiplist.py [readers] [writes] [keys]
+"""
+import bisect
+import random
+import sys
+import threading
+
+from VersionedSkipList import VersionedSkiplist
+
+SNAPSHOT_EVERY = 50
+OPEN_SNAPSHOTS = 8
+
+
+def writer(s, seed, writes, keys, snapshots, done):
+    rng = random.Random(seed)
+    present = set(s)
+    try:
+        for j in range(writes):
+            k = rng.randrange(keys)
+            if(k in present):
+                s.erase(k)
+                present.discard(k)
+            else:
+                s.add(k)
+                present.add(k)
+            if(j % SNAPSHOT_EVERY == 0):
+                # only this thread writes, so the copy matches the snapshot
+                snapshots.append((s.snapshot(), sorted(present)))
+                if(len(snapshots) > OPEN_SNAPSHOTS):
+                    snapshots.pop(0)
+    finally:
+        done.set()
+
+
+def reader(seed, keys, snapshots, done, errors):
+    rng = random.Random(seed)
+    try:
+        while(not done.is_set()):
+            if(not snapshots):
+                continue
+            try:
+                sn, expected = snapshots[rng.randrange(len(snapshots))]
+            except IndexError:
+                continue
+            assert list(sn) == expected, sn.version
+            lo = rng.randrange(keys)
+            hi = lo + rng.randrange(keys // 4 + 1)
+            want = expected[bisect.bisect_left(expected, lo):bisect.bisect_right(expected, hi)]
+            got = list(sn.irange(lo, hi))
+            assert got == want, (sn.version, lo, hi, got, want)
+            got = list(sn.irange(lo, None))
+            assert got == expected[bisect.bisect_left(expected, lo):], (sn.version, lo)
+            k = rng.randrange(keys)
+            i = bisect.bisect_left(expected, k)
+            assert (k in sn) == (i < len(expected) and expected[i] == k), (sn.version, k)
+    except BaseException as e:
+        errors.append(e)
+        done.set()
+
+
+def main(readers, writes, keys):
+    s = VersionedSkiplist(seed = 1)
+    for k in range(0, keys, 2):
+        s.add(k)
+    snapshots = []
+    done = threading.Event()
+    errors = []
+    old = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    try:
+        threads = [threading.Thread(target = reader, args = (i, keys, snapshots, done, errors))
+                   for i in range(readers)]
+        threads.append(threading.Thread(target = writer,
+                                        args = (s, readers, writes, keys, snapshots, done)))
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(old)
+    if(errors):
+        raise errors[0]
+    # a fresh snapshot agrees with the live list
+    with s.snapshot() as sn:
+        assert list(sn) == list(s)
+    print("ok: %d readers, %d writes on %d keys, %d keys left" % (readers, writes, keys, len(s)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 20000,
+         int(sys.argv[3]) if len(sys.argv) > 3 else 500)
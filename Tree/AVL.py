@@ -2,14 +2,16 @@
     A AVL Tree implementation
 """
 
-from BST import BSTNode, BST
+from BST import CompactBSTNode, BSTNode, BST
 
 
-class AVLNode(BSTNode):
+class CompactAVLNode(CompactBSTNode):
     """
-    A AVLNode which is augmented to keep track of 
+    A CompactBSTNode which is augmented to keep track of
     the height of the subtree rooted at this node.
     """
+    __slots__ = ('height',)
+
     def __init__(self, key, parent):
         """
         Creates a node.
@@ -18,47 +20,66 @@ class AVLNode(BSTNode):
             parent: The node's parent.
             k: key of the node.
         """
-        super(AVLNode, self).__init__(key, parent)
+        super(CompactAVLNode, self).__init__(key, parent)
         self.height = 1
 
     def _update_info(self):
         self.height = max(AVL._height(self.left), AVL._height(self.right)) + 1
 
-    def list(self, k1, k2, result = []):
+    def list(self, k1, k2, result = None):
+        """
+        Appends the keys strictly between k1 and k2 from the subtree
+        rooted at this node to result, in ascending order.
+
+        Returns:
+            The result list.
+
+        Running Time:
+            O(log(n) + m), m is the number of keys listed.
+        """
+        if result is None:
+            result = []
+        if(self.key > k1 and self.left is not None):
+            self.left.list(k1, k2, result)
         if(self.key < k2 and self.key > k1):
             result.append(self.key)
-            if(self.left is not None):
-                self.left.list(k1, k2, result)
-            if(self.right is not None):
-                self.right.list(k1, k2, result)
-        elif(self.key > k2 and self.left is not None):
-            self.left.list(k1, k2, result)
-        elif(self.key < k1 and self.right is not None):
+        if(self.key < k2 and self.right is not None):
             self.right.list(k1, k2, result)
+        return result
 
-    def check_ri(self):
+    def _check_node(self):
         """
-        Checks the BST representation invariant around this node.
-    
-        Assert is not true if the RI is violated.
+        Checks the AVL representation invariant at this node only.
 
         Running Time:
-            O(n)
+            O(1)
         """
-        assert((AVL._height(self.right) - AVL._height(self.left) < 2) or\
-            (AVL._height(self.right) - AVL._height(self.left) > -2))
-        if self.left is not None:
-            assert(self.left.key <= self.key)
-            assert(self.left.parent is self)
-            self.left.check_ri()
-        if self.right is not None:
-            assert(self.right.key >= self.key)
-            assert(self.right.parent is self)
-            self.right.check_ri()
+        assert(abs(AVL._height(self.right) - AVL._height(self.left)) < 2)
+        assert(self.height == max(AVL._height(self.left), AVL._height(self.right)) + 1)
+        super(CompactAVLNode, self)._check_node()
+
+class AVLNode(CompactAVLNode, BSTNode):
+    """
+    A AVLNode which is augmented to keep track of 
+    the height of the subtree rooted at this node.
+    Callers may attach their own attributes to it.
+    """
+
 
 class AVL(BST):
     def __init__(self, node_class = AVLNode):
         super(AVL, self).__init__(node_class)
+        # running totals over the life of the tree
+        self.touch_count = 0
+        self.rotation_count = 0
+        # the nodes touched and rotations done by the last insert or remove
+        self.last_touched = 0
+        self.last_rotations = 0
+
+    def _start_operation(self):
+        # resets the per-operation counters
+        self.last_touched = 0
+        self.last_rotations = 0
 
     @staticmethod
     def _height(node):
@@ -68,21 +89,494 @@ class AVL(BST):
             return node.height
 
     def _rebalance(self, node):
+        """
+        Restores the AVL property from node up to the root.
+
+        node is the lowest node whose children changed. The walk stops
+        as soon as a subtree keeps its height, since nothing above it
+        can be out of balance then; _propagate_info finishes the walk
+        for trees that augment more than the height.
+
+        Running Time:
+            O(log(n)), O(1) rotations amortized.
+        """
+        first = True
         while(node is not None):
+            old_height = node.height
             node._update_info()
+            self.touch_count += 1
+            self.last_touched += 1
             if(AVL._height(node.right) - AVL._height(node.left) >= 2):
-                if(AVL._height(node.right.right) > AVL._height(node.right.left)):
+                if(AVL._height(node.right.right) >= AVL._height(node.right.left)):
                     self._left_rotate(node)
                 else:
                     self._right_rotate(node.right)
                     self._left_rotate(node)
+                # the rotated up node now roots this subtree
+                top = node.parent
             elif(AVL._height(node.left) - AVL._height(node.right) >= 2):
-                if(AVL._height(node.left.left) > AVL._height(node.left.right)):
+                if(AVL._height(node.left.left) >= AVL._height(node.left.right)):
                     self._right_rotate(node)
                 else:
                     self._left_rotate(node.left)
                     self._right_rotate(node)
-            node = node.parent
+                top = node.parent
+            else:
+                top = node
+            # the starting node may be new or reused, its old height
+            # says nothing, so never stop there
+            if not first and top.height == old_height:
+                self._propagate_info(top.parent)
+                return
+            first = False
+            node = top.parent
+
+    def _propagate_info(self, node):
+        """
+        Refreshes the augmented info from node up to the root after
+        rebalancing stopped early. Heights are already correct, so
+        there is nothing to do for a plain AVL.
+        """
+        pass
+
+    def _join(self, left, node, right):
+        """
+        Joins two AVL subtrees with a detached middle node.
+
+        Every key in left must be <= node.key and every key in right
+        must be >= node.key. Both subtrees must be roots (parent is None).
+
+        Args:
+            left: The root of the left subtree, or None.
+            node: The detached node that goes between them.
+            right: The root of the right subtree, or None.
+
+        Returns:
+            The root of the joined subtree.
+
+        Running Time:
+            O(log(n))
+        """
+        if(abs(AVL._height(left) - AVL._height(right)) <= 1):
+            node.left, node.right, node.parent = left, right, None
+            if left is not None:
+                left.parent = node
+            if right is not None:
+                right.parent = node
+            node._update_info()
+            return node
+        if(AVL._height(left) > AVL._height(right)):
+            # walk down the right spine of the taller tree until the
+            # subtree is short enough to sit next to right
+            self.root = left
+            p, c = None, left
+            while(AVL._height(c) > AVL._height(right) + 1):
+                p, c = c, c.right
+            node.left, node.right, node.parent = c, right, p
+            p.right = node
+        else:
+            self.root = right
+            p, c = None, right
+            while(AVL._height(c) > AVL._height(left) + 1):
+                p, c = c, c.left
+            node.left, node.right, node.parent = left, c, p
+            p.left = node
+        if node.left is not None:
+            node.left.parent = node
+        if node.right is not None:
+            node.right.parent = node
+        self._rebalance(node)
+        return self.root
+
+    @classmethod
+    def from_sorted(cls, iterable):
+        """
+        Builds a balanced tree from keys in non-decreasing order.
+
+        The input is consumed one key at a time and never copied into
+        a list, so it can be a generator over a very large stream.
+        The i-th key (1-indexed) is placed at the level given by the
+        number of trailing zeros of i, which lays the keys out as a
+        forest of perfect trees along the right spine; the spine is
+        then folded back together with joins.
+
+        Args:
+            iterable: The keys, in non-decreasing order.
+
+        Returns:
+            The new tree.
+
+        Running Time:
+            O(n)
+        """
+        tree = cls()
+        tree._load_sorted(tree.node_class(k, None) for k in iterable)
+        return tree
+
+    def _load_sorted(self, nodes):
+        """
+        Builds this empty tree out of new detached nodes given in
+        non-decreasing key order, see from_sorted.
+
+        Running Time:
+            O(n)
+        """
+        # spine[j] is a node whose left subtree is a finished
+        # perfect tree, levels[j] its level (strictly decreasing)
+        spine = []
+        levels = []
+        last = None
+        i = 0
+        for node in nodes:
+            if last is not None and node.key < last:
+                raise ValueError("keys are not sorted")
+            last = node.key
+            i += 1
+            level = (i & -i).bit_length() - 1
+            popped = None
+            while(levels and levels[-1] < level):
+                popped = spine.pop()
+                levels.pop()
+                popped._update_info()
+            node.left = popped
+            if popped is not None:
+                popped.parent = node
+            if spine:
+                spine[-1].right = node
+                node.parent = spine[-1]
+            spine.append(node)
+            levels.append(level)
+        # fold the spine bottom-up: each spine node joins its
+        # perfect left subtree with everything already folded
+        right = None
+        while(spine):
+            node = spine.pop()
+            left = node.left
+            if left is not None:
+                left.parent = None
+            right = self._join(left, node, right)
+        self.root = right
+
+    @classmethod
+    def from_iterable(cls, iterable):
+        """
+        Builds a balanced tree from keys in any order.
+
+        Args:
+            iterable: The keys.
+
+        Returns:
+            The new tree.
+
+        Running Time:
+            O(n*log(n)) for the sort, O(n) if the keys are already sorted.
+        """
+        return cls.from_sorted(sorted(iterable))
+
+    @staticmethod
+    def _detach(node):
+        """
+        Cuts node off from its children.
+
+        Returns:
+            The (left, right) children of node, now roots.
+
+        Running Time:
+            O(1)
+        """
+        left, right = node.left, node.right
+        node.left, node.right, node.parent = None, None, None
+        if left is not None:
+            left.parent = None
+        if right is not None:
+            right.parent = None
+        return left, right
+
+    def _join2(self, left, right):
+        """
+        Joins two AVL subtrees without a middle node.
+
+        Every key in left must be <= every key in right.
+
+        Returns:
+            The root of the joined subtree.
+
+        Running Time:
+            O(log(n))
+        """
+        if left is None:
+            return right
+        if right is None:
+            return left
+        # take the maximum of left out and use it as the middle node
+        self.root = left
+        m = left.find_max()
+        p = m.parent
+        if p is None:
+            left = m.left
+            if left is not None:
+                left.parent = None
+        else:
+            p.right = m.left
+            if m.left is not None:
+                m.left.parent = p
+            self._rebalance(p)
+            left = self.root
+        m.left, m.parent = None, None
+        return self._join(left, m, right)
+
+    def _split(self, node, k, inclusive = False):
+        """
+        Splits the subtree rooted at node around key k.
+
+        Every copy of a repeated key k goes to the same side.
+
+        Args:
+            node: The root of the subtree.
+            k: The key to split at.
+            inclusive: Send the keys equal to k left instead of right.
+
+        Returns:
+            (left, right) where left holds the keys < k (<= k if
+            inclusive) and right holds the rest.
+
+        Running Time:
+            O(log(n))
+        """
+        if node is None:
+            return None, None
+        left, right = AVL._detach(node)
+        if k < node.key or (not inclusive and k == node.key):
+            # copies of k may also sit in the left subtree
+            l, r = self._split(left, k, inclusive)
+            return l, self._join(r, node, right)
+        else:
+            l, r = self._split(right, k, inclusive)
+            return self._join(left, node, l), r
+
+    def _split3(self, node, k):
+        """
+        Splits the subtree rooted at node into the keys < k,
+        the keys equal to k and the keys > k.
+
+        Running Time:
+            O(log(n))
+        """
+        l, r = self._split(node, k)
+        e, g = self._split(r, k, True)
+        return l, e, g
+
+    @staticmethod
+    def _nodes(node):
+        """
+        Returns the nodes of the subtree rooted at node in key order.
+
+        Running Time:
+            O(m), m is the size of the subtree.
+        """
+        result = []
+        stack = []
+        while(stack or node is not None):
+            if node is not None:
+                stack.append(node)
+                node = node.left
+            else:
+                node = stack.pop()
+                result.append(node)
+                node = node.right
+        return result
+
+    def _keep(self, node, c):
+        """
+        Keeps c nodes of a subtree whose keys are all equal.
+
+        Returns:
+            The root of the subtree of the kept nodes (all of
+            them if there are at most c).
+
+        Running Time:
+            O(m), m is the size of the subtree.
+        """
+        if node is None or c <= 0:
+            return None
+        nodes = AVL._nodes(node)
+        if c >= len(nodes):
+            return node
+        return self._build(nodes, 0, c)
+
+    def _build(self, nodes, lo, hi):
+        # links nodes[lo:hi] into a perfectly balanced subtree
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        node = nodes[mid]
+        node.parent = None
+        node.left = self._build(nodes, lo, mid)
+        node.right = self._build(nodes, mid + 1, hi)
+        if node.left is not None:
+            node.left.parent = node
+        if node.right is not None:
+            node.right.parent = node
+        node._update_info()
+        return node
+
+    def split(self, k):
+        """
+        Splits the tree around key k.
+
+        This tree is emptied; its nodes are moved into the result.
+
+        Args:
+            k: The key to split at.
+
+        Returns:
+            Two trees, the first with the keys < k and the
+            second with the keys >= k (every copy of k).
+
+        Running Time:
+            O(log(n))
+        """
+        l, r = self._split(self.root, k)
+        left = type(self)(node_class = self.node_class)
+        right = type(self)(node_class = self.node_class)
+        left.root, right.root, self.root = l, r, None
+        self._version += 1
+        return left, right
+
+    @classmethod
+    def join(cls, left, k, right):
+        """
+        Joins two trees and a new key k in between them.
+
+        Every key in left must be <= k and every key in right must be >= k.
+        Both trees are emptied; their nodes are moved into the result.
+
+        Args:
+            left: The tree with the smaller keys.
+            k: The key of the new middle node.
+            right: The tree with the bigger keys.
+
+        Returns:
+            The joined tree.
+
+        Running Time:
+            O(log(n))
+        """
+        if((left.root is not None and left.find_max() > k) or
+           (right.root is not None and right.find_min() < k)):
+            raise ValueError("keys are not ordered around %r" % (k,))
+        return cls._join_trees(left, left.node_class(k, None), right)
+
+    @classmethod
+    def _join_trees(cls, left, node, right):
+        # joins with a new detached middle node, the keys are already checked
+        tree = cls(node_class = left.node_class)
+        tree.root = tree._join(left.root, node, right.root)
+        left.root, right.root = None, None
+        left._version += 1
+        right._version += 1
+        return tree
+
+    # The set operations treat the trees as multisets: a key that is
+    # i times in a and j times in b ends up max(i, j) times in the union,
+    # min(i, j) times in the intersection and max(i - j, 0) times in
+    # the difference. For trees without repeated keys these are the
+    # plain set operations.
+
+    def _union(self, a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        k = b.key
+        l2, e2, r2 = self._split3(b, k)
+        l1, e1, r1 = self._split3(a, k)
+        # keep the longer run of k as it is
+        e = e1 if len(AVL._nodes(e1)) >= len(AVL._nodes(e2)) else e2
+        l = self._union(l1, l2)
+        r = self._union(r1, r2)
+        return self._join2(self._join2(l, e), r)
+
+    def _intersection(self, a, b):
+        if a is None or b is None:
+            return None
+        k = b.key
+        l2, e2, r2 = self._split3(b, k)
+        l1, e1, r1 = self._split3(a, k)
+        e = self._keep(e1, len(AVL._nodes(e2)))
+        l = self._intersection(l1, l2)
+        r = self._intersection(r1, r2)
+        return self._join2(self._join2(l, e), r)
+
+    def _difference(self, a, b):
+        if a is None:
+            return None
+        if b is None:
+            return a
+        k = b.key
+        l2, e2, r2 = self._split3(b, k)
+        l1, e1, r1 = self._split3(a, k)
+        e = None
+        if e1 is not None:
+            e = self._keep(e1, len(AVL._nodes(e1)) - len(AVL._nodes(e2)))
+        l = self._difference(l1, l2)
+        r = self._difference(r1, r2)
+        return self._join2(self._join2(l, e), r)
+
+    def update(self, other):
+        """
+        Adds every key of other to this tree (union).
+
+        A key that is i times in this tree and j times in other
+        ends up max(i, j) times, so a key in both trees of a set
+        is kept once.
+        other is emptied; its nodes are moved into this tree.
+
+        Running Time:
+            O(m*log(n/m + 1) + r), m is the size of the smaller tree
+            and r the number of copies of keys that are repeated.
+        """
+        self.root = self._union(self.root, other.root)
+        other.root = None
+        self._version += 1
+        other._version += 1
+        return self
+
+    def intersection_update(self, other):
+        """
+        Keeps only the keys of this tree that are also in other.
+
+        A key that is i times in this tree and j times in other
+        is kept min(i, j) times.
+        other is emptied.
+
+        Running Time:
+            O(m*log(n/m + 1) + r), m is the size of the smaller tree
+            and r the number of copies of keys that are repeated.
+        """
+        self.root = self._intersection(self.root, other.root)
+        other.root = None
+        self._version += 1
+        other._version += 1
+        return self
+
+    def difference_update(self, other):
+        """
+        Removes every key of other from this tree.
+
+        Each copy in other removes one copy: a key that is i times
+        in this tree and j times in other is kept max(i - j, 0) times.
+        other is emptied.
+
+        Running Time:
+            O(m*log(n/m + 1) + r), m is the size of the smaller tree
+            and r the number of copies of keys that are repeated.
+        """
+        self.root = self._difference(self.root, other.root)
+        other.root = None
+        self._version += 1
+        other._version += 1
+        return self
 
     def _left_rotate(self, x):
         y = x.right
@@ -101,6 +595,8 @@ class AVL(BST):
         y.left = x
         x._update_info()
         y._update_info()
+        self.rotation_count += 1
+        self.last_rotations += 1
 
     def _right_rotate(self, x):
         y = x.left
@@ -119,6 +615,8 @@ class AVL(BST):
         x.parent = y
         x._update_info()
         y._update_info()
+        self.rotation_count += 1
+        self.last_rotations += 1
 
     def insert(self, k):
         """
@@ -133,32 +631,36 @@ class AVL(BST):
         Running Time:
             O(log(n))
         """
+        self._start_operation()
         node = super(AVL, self).insert(k)
         self._rebalance(node)
         return node
 
-    def remove(self, k):
+    def _remove_node(self, node):
         """
-        Removes and returns the node with key k from the AVL.
-
-        Args:
-            k: The key of the node that we want to delete.
-            
-        Returns:
-            The deleted node with key k.
+        Removes node from the AVL and rebalances.
 
         Running Time:
             O(log(n))
         """
-        node = super(AVL, self).remove(k)
+        self._start_operation()
+        node = super(AVL, self)._remove_node(node)
         self._rebalance(node.parent)
         return node
 
-    def list(self, k1, k2, result = []):
-        if(self.root is None):
-            return result
-        else:
-            self.root.list(k1, k2, result)
+    def list(self, k1, k2, result = None):
+        """
+        Returns the keys strictly between k1 and k2 in ascending order.
+
+        Use irange to stream the keys or to include the endpoints.
+
+        Running Time:
+            O(log(n) + m), m is the number of keys listed.
+        """
+        if result is None:
+            result = []
+        result.extend(self.irange(k1, k2, inclusive = (False, False)))
+        return result
 
     def check_ri(self):
         """
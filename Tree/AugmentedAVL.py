@@ -0,0 +1,321 @@
+"""
+    A AugmentedAVL implementation:
+    A SizeAVL that also keeps user registered monoid aggregates
+    (sum, min, max, count or a custom one) of the subtree rooted at
+    each node, which enables O(log(n)) range aggregate queries.
+    Every node also carries a value, so a monoid can aggregate values
+    (e.g. the sum of the values whose keys are between k1 and k2).
+"""
+import operator
+
+from SizeAVL import SizeAVLNode, SizeAVL
+
+
+class Monoid(object):
+    """
+    An associative operation with an identity element.
+
+    Attributes:
+        op: the associative binary operation
+        identity: the identity element of op
+        lift: maps a node to the value being aggregated
+    """
+    def __init__(self, op, identity, lift = None):
+        """
+        Creates a monoid.
+
+        Args:
+            op: The associative binary operation.
+            identity: The identity element of op.
+            lift: Maps a node to the value being aggregated, defaults
+                to the node's key; lambda node: node.value aggregates
+                the values.
+        """
+        self.op = op
+        self.identity = identity
+        self.lift = lift or (lambda node: node.key)
+
+    @staticmethod
+    def sum(lift = None):
+        return Monoid(operator.add, 0, lift)
+
+    @staticmethod
+    def min(lift = None):
+        return Monoid(min, float('inf'), lift)
+
+    @staticmethod
+    def max(lift = None):
+        return Monoid(max, float('-inf'), lift)
+
+    @staticmethod
+    def count():
+        return Monoid(operator.add, 0, lambda node: 1)
+
+
+class AugmentedAVLNode(SizeAVLNode):
+    """
+    A SizeAVLNode which is augmented to keep track of the aggregate
+    of every registered monoid over the subtree rooted at this node.
+
+    The registered monoids live on the node class (see AugmentedAVL),
+    aggregates[i] belongs to the i-th monoid.
+    """
+    __slots__ = ('value', 'aggregates')
+
+    monoids = ()
+
+    def __init__(self, key, parent, value = None):
+        """
+        Creates a node.
+
+        Args:
+            parent: The node's parent.
+            k: key of the node.
+            value: value of the node.
+        """
+        super(AugmentedAVLNode, self).__init__(key, parent)
+        self.value = value
+        self.aggregates = [m.identity for m in self.monoids]
+
+    def _swap_payload(self, other):
+        super(AugmentedAVLNode, self)._swap_payload(other)
+        self.value, other.value = other.value, self.value
+
+    def _update_info(self):
+        super(AugmentedAVLNode, self)._update_info()
+        left, right = self.left, self.right
+        aggregates = []
+        for i, m in enumerate(self.monoids):
+            a = m.lift(self)
+            if left is not None:
+                a = m.op(left.aggregates[i], a)
+            if right is not None:
+                a = m.op(a, right.aggregates[i])
+            aggregates.append(a)
+        self.aggregates = aggregates
+
+
+class AugmentedAVL(SizeAVL):
+    """
+    A SizeAVL that keeps monoid aggregates of every subtree.
+
+    Aggregates are recomputed by _update_info, which runs on every
+    node whose subtree changes during insert, remove and rotations,
+    so each update costs O(log(n)) per monoid.
+    """
+    def __init__(self, node_class = None, monoids = None):
+        """
+        Creates a AugmentedAVL.
+
+        Args:
+            node_class: A node class produced by another AugmentedAVL,
+                to share its monoids (used by split and join).
+            monoids: A dict that maps a name to a Monoid.
+        """
+        if node_class is None:
+            # each tree gets its own node class that holds its monoids
+            node_class = type('AugmentedAVLNode', (AugmentedAVLNode,),
+                              {'__slots__': (), 'monoids': (), 'names': {}})
+        super(AugmentedAVL, self).__init__(node_class)
+        for name, monoid in (monoids or {}).items():
+            self.register(name, monoid)
+
+    @classmethod
+    def from_sorted(cls, iterable, monoids = None, with_values = False):
+        """
+        Builds a balanced tree from keys in non-decreasing order,
+        with the monoids registered before the nodes are linked.
+
+        Args:
+            iterable: The keys, or (key, value) pairs if with_values,
+                in non-decreasing key order.
+            monoids: A dict that maps a name to a Monoid.
+            with_values: Whether iterable yields (key, value) pairs.
+
+        Returns:
+            The new tree.
+
+        Running Time:
+            O(n) per monoid
+        """
+        tree = cls(monoids = monoids)
+        if with_values:
+            nodes = (tree.node_class(k, None, v) for k, v in iterable)
+        else:
+            nodes = (tree.node_class(k, None) for k in iterable)
+        tree._load_sorted(nodes)
+        return tree
+
+    @classmethod
+    def from_iterable(cls, iterable, monoids = None, with_values = False):
+        """
+        Builds a balanced tree from keys (or (key, value) pairs if
+        with_values) in any order, see from_sorted.
+
+        Running Time:
+            O(n*log(n)) for the sort, O(n) per monoid for the build.
+        """
+        if with_values:
+            items = sorted(iterable, key = operator.itemgetter(0))
+        else:
+            items = sorted(iterable)
+        return cls.from_sorted(items, monoids, with_values)
+
+    @classmethod
+    def join(cls, left, k, right, value = None):
+        """
+        Joins two trees that share their monoids (left was split off
+        right or made by the same tree) and a new key k with value in
+        between them, see AVL.join.
+
+        Running Time:
+            O(log(n)) per monoid
+        """
+        if((left.root is not None and left.find_max() > k) or
+           (right.root is not None and right.find_min() < k)):
+            raise ValueError("keys are not ordered around %r" % (k,))
+        return cls._join_trees(left, left.node_class(k, None, value), right)
+
+    def insert(self, k, value = None):
+        """
+        Inserts a node with key k and value into the tree. The value is
+        set before the aggregates above the node are recomputed.
+
+        Returns:
+            The node inserted.
+
+        Running Time:
+            O(log(n)) per monoid
+        """
+        self._start_operation()
+        self._version += 1
+        node = self.node_class(k, None, value)
+        if self.root is None:
+            self.root = node
+        else:
+            self.root.insert(node)
+        self._rebalance(node)
+        return node
+
+    def set_value(self, node, value):
+        """
+        Sets the value of node, which must be in this tree, and
+        recomputes the aggregates from node up to the root.
+
+        Running Time:
+            O(log(n)) per monoid
+        """
+        node.value = value
+        self._propagate_info(node)
+
+    def register(self, name, monoid):
+        """
+        Registers a monoid under name and computes its aggregates.
+
+        Args:
+            name: The name used to query the aggregate.
+            monoid: The Monoid.
+
+        Running Time:
+            O(n)
+        """
+        if name in self.node_class.names:
+            raise ValueError("monoid %r is already registered" % (name,))
+        self.node_class.names[name] = len(self.node_class.monoids)
+        self.node_class.monoids += (monoid,)
+        # children first, so every node sees up to date aggregates
+        stack = [(self.root, False)] if self.root is not None else []
+        while(stack):
+            node, visited = stack.pop()
+            if visited:
+                node._update_info()
+                continue
+            stack.append((node, True))
+            if node.left is not None:
+                stack.append((node.left, False))
+            if node.right is not None:
+                stack.append((node.right, False))
+
+    def total(self, name):
+        """
+        Returns the aggregate of the monoid name over the whole tree.
+
+        Running Time:
+            O(1)
+        """
+        i = self.node_class.names[name]
+        if self.root is None:
+            return self.node_class.monoids[i].identity
+        return self.root.aggregates[i]
+
+    def aggregate(self, name, k1, k2):
+        """
+        Returns the aggregate of the monoid name over the nodes
+        whose key is between k1 (included) and k2 (excluded).
+
+        Running Time:
+            O(log(n))
+        """
+        i = self.node_class.names[name]
+        m = self.node_class.monoids[i]
+        # find the highest node inside [k1, k2)
+        split = self.root
+        while(split is not None):
+            if split.key < k1:
+                split = split.right
+            elif split.key >= k2:
+                split = split.left
+            else:
+                break
+        if split is None:
+            return m.identity
+        # along the left boundary every node >= k1 brings its right subtree
+        left = m.identity
+        node = split.left
+        while(node is not None):
+            if node.key >= k1:
+                a = m.lift(node)
+                if node.right is not None:
+                    a = m.op(a, node.right.aggregates[i])
+                left = m.op(a, left)
+                node = node.left
+            else:
+                node = node.right
+        # along the right boundary every node < k2 brings its left subtree
+        right = m.identity
+        node = split.right
+        while(node is not None):
+            if node.key < k2:
+                a = m.lift(node)
+                if node.left is not None:
+                    a = m.op(node.left.aggregates[i], a)
+                right = m.op(right, a)
+                node = node.right
+            else:
+                node = node.left
+        return m.op(m.op(left, m.lift(split)), right)
+
+    def _check_node_aggregates(self, node):
+        for i, m in enumerate(self.node_class.monoids):
+            a = m.lift(node)
+            if node.left is not None:
+                a = m.op(node.left.aggregates[i], a)
+            if node.right is not None:
+                a = m.op(a, node.right.aggregates[i])
+            assert(node.aggregates[i] == a)
+
+    def check_ri(self):
+        """
+        Checks the AugmentedAVL representation invariant.
+
+        Assert is not true if the RI is violated.
+        """
+        super(AugmentedAVL, self).check_ri()
+        stack = [self.root] if self.root is not None else []
+        while(stack):
+            node = stack.pop()
+            self._check_node_aggregates(node)
+            if node.left is not None:
+                stack.append(node.left)
+            if node.right is not None:
+                stack.append(node.right)
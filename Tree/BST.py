@@ -4,8 +4,14 @@
 
 
 
-class BSTNode(object):
-    """A node in the BST tree."""
+class CompactBSTNode(object):
+    """
+    A node in the BST tree without an instance __dict__, so it takes
+    a fraction of the memory of a BSTNode but cannot carry extra
+    attributes. Pass node_class = CompactBSTNode to BST to use it.
+    """
+    __slots__ = ('key', 'parent', 'left', 'right')
+
     def __init__(self, key, parent):
         """
         Creates a node.
@@ -74,18 +80,15 @@ class BSTNode(object):
         Running Time:
             O(log(n))
         """
-        if k == self.key:
-            return self
-        elif k < self.key:
-            if self.left is None:
-                return None
-            else:
-                return self.left.find(k)
-        else:
-            if self.right is None:  
-                return None
+        node = self
+        while(node is not None):
+            if k == node.key:
+                return node
+            elif k < node.key:
+                node = node.left
             else:
-                return self.right.find(k)
+                node = node.right
+        return None
 
     def insert(self, node):
         """
@@ -97,18 +100,20 @@ class BSTNode(object):
         Running Time:
             O(log(n))
         """
-        if(node.key < self.key):
-            if(self.left is None):
-                node.parent = self
-                self.left = node
-            else:
-                self.left.insert(node)
-        else:
-            if(self.right is None):
-                node.parent = self
-                self.right = node
+        current = self
+        while(True):
+            if(node.key < current.key):
+                if(current.left is None):
+                    node.parent = current
+                    current.left = node
+                    return
+                current = current.left
             else:
-                self.right.insert(node)
+                if(current.right is None):
+                    node.parent = current
+                    current.right = node
+                    return
+                current = current.right
 
     def remove(self):
         """
@@ -141,9 +146,19 @@ class BSTNode(object):
             return self
         else:
             next_larger = self.next_larger()
-            self.key, next_larger.key = next_larger.key, self.key
+            self._swap_payload(next_larger)
             return next_larger.remove()
                 
+    def _swap_payload(self, other):
+        """
+        Swaps the data carried by this node and other (the key here),
+        leaving the tree links in place. Used by remove.
+
+        Running Time:
+            O(1)
+        """
+        self.key, other.key = other.key, self.key
+
     def next_larger(self):
         """
         Returns the node with the next larger key (the successor) in the BST.
@@ -158,6 +173,21 @@ class BSTNode(object):
             return current.parent
         else:
             return self.right.find_min()
+
+    def next_smaller(self):
+        """
+        Returns the node with the next smaller key (the predecessor) in the BST.
+
+        Running Time:
+            O(log(n))
+        """
+        if(self.left is None):
+            current = self
+            while(current.parent and current.parent.left is current):
+                current = current.parent
+            return current.parent
+        else:
+            return self.left.find_max()
     
     def find_max(self):
         """
@@ -170,10 +200,10 @@ class BSTNode(object):
         Running Time:
             O(log(n))
         """
-        if(self.right is None):
-            return self
-        else:
-            return self.right.find_max()
+        current = self
+        while(current.right is not None):
+            current = current.right
+        return current
 
     def find_min(self):
         """
@@ -186,10 +216,10 @@ class BSTNode(object):
         Running Time:
             O(log(n))
         """
-        if(self.left is None):
-            return self
-        else:
-            return self.left.find_min()
+        current = self
+        while(current.left is not None):
+            current = current.left
+        return current
 
     def check_ri(self):
         """
@@ -200,14 +230,34 @@ class BSTNode(object):
         Running Time:
             O(n)
         """
+        # walk the subtree with an explicit stack so that
+        # a degenerate (list-like) tree does not hit the recursion limit
+        stack = [self]
+        while(stack):
+            node = stack.pop()
+            node._check_node()
+            if node.left is not None:
+                stack.append(node.left)
+            if node.right is not None:
+                stack.append(node.right)
+
+    def _check_node(self):
+        """
+        Checks the BST representation invariant at this node only.
+
+        Running Time:
+            O(1)
+        """
         if self.left is not None:
             assert(self.left.key <= self.key)
             assert(self.left.parent is self)
-            self.left.check_ri()
         if self.right is not None:
             assert(self.right.key >= self.key)
             assert(self.right.parent is self)
-            self.right.check_ri()
+
+class BSTNode(CompactBSTNode):
+    """A node in the BST tree. Callers may attach their own attributes to it."""
+
 
 class BST(object):
     """A binary search tree. Node type is TreeNode"""
@@ -220,6 +270,9 @@ class BST(object):
         """
         self.root = None
         self.node_class = node_class
+        # bumped on every structural change, so cursors can
+        # tell that the node they point at may have moved
+        self._version = 0
 
     """str method is copied from mit 6.006 material"""
     def __str__(self):
@@ -255,6 +308,7 @@ class BST(object):
         Running Time:
             O(log(n))
         """
+        self._version += 1
         node = self.node_class(k, None)
         if(self.root is None):
             self.root = node
@@ -275,7 +329,20 @@ class BST(object):
         Running Time:
             O(log(n))
         """
-        node = self.find(k)
+        return self._remove_node(self.find(k))
+
+    def _remove_node(self, node):
+        """
+        Removes node, which must be in this tree, without searching for it.
+
+        Returns:
+            The node unlinked from the tree, which carries node's key
+            (it may be another node when node has two children).
+
+        Running Time:
+            O(log(n))
+        """
+        self._version += 1
         if(node is self.root):
             pseudoroot = self.node_class(0, None)
             pseudoroot.left = self.root
@@ -287,6 +354,10 @@ class BST(object):
             # have to check None
             if self.root is not None:
                 self.root.parent = None
+            # do not leak the pseudo node to callers that walk
+            # up from the removed node (e.g. AVL rebalancing)
+            if root.parent is pseudoroot:
+                root.parent = None
             return root
         else:
             return node.remove()
@@ -324,5 +395,253 @@ class BST(object):
         
         return self.root and self.root.find_max().key
 
+    def _lower_bound(self, k, strict = False):
+        """
+        Returns the first node whose key is >= k (> k if strict).
+
+        Running Time:
+            O(log(n))
+        """
+        candidate = None
+        node = self.root
+        while(node is not None):
+            if(node.key > k or (not strict and node.key == k)):
+                candidate = node
+                node = node.left
+            else:
+                node = node.right
+        return candidate
+
+    def _floor_node(self, k, strict = False):
+        """
+        Returns the last node whose key is <= k (< k if strict).
+
+        Running Time:
+            O(log(n))
+        """
+        candidate = None
+        node = self.root
+        while(node is not None):
+            if(node.key < k or (not strict and node.key == k)):
+                candidate = node
+                node = node.right
+            else:
+                node = node.left
+        return candidate
+
+    def cursor(self, k = None):
+        """
+        Returns a Cursor on this tree, positioned at the first key >= k
+        if k is given.
+
+        Running Time:
+            O(log(n))
+        """
+        cursor = Cursor(self)
+        if k is not None:
+            cursor.seek(k)
+        return cursor
+
+    def __iter__(self):
+        """
+        Yields every key in ascending order.
+
+        The walk follows parent pointers, so it uses O(1) extra memory.
+        The tree must not be modified while iterating.
+
+        Running Time:
+            O(n) for the whole walk, O(log(n)) for the first key.
+        """
+        node = self.root and self.root.find_min()
+        while(node is not None):
+            yield node.key
+            node = node.next_larger()
+
+    def __reversed__(self):
+        """
+        Yields every key in descending order.
+
+        Running Time:
+            O(n) for the whole walk, O(log(n)) for the first key.
+        """
+        node = self.root and self.root.find_max()
+        while(node is not None):
+            yield node.key
+            node = node.next_smaller()
+
+    def irange(self, lo = None, hi = None, inclusive = (True, True)):
+        """
+        Yields the keys between lo and hi in ascending order.
+
+        Args:
+            lo: The lower bound, or None for no lower bound.
+            hi: The upper bound, or None for no upper bound.
+            inclusive: A pair of booleans, whether lo and hi are included.
+
+        Running Time:
+            O(log(n) + m), m is the number of keys yielded.
+        """
+        if lo is None:
+            node = self.root and self.root.find_min()
+        else:
+            node = self._lower_bound(lo, not inclusive[0])
+        while(node is not None):
+            if hi is not None and (node.key > hi or
+                                   (node.key == hi and not inclusive[1])):
+                return
+            yield node.key
+            node = node.next_larger()
+
+    def iter_from(self, k):
+        """
+        Yields the keys >= k in ascending order.
+
+        Running Time:
+            O(log(n) + m), m is the number of keys yielded.
+        """
+        return self.irange(k, None)
+
+
+class Cursor(object):
+    """
+    A finger into a BST that remembers its last node, so that searches
+    near the previous position only climb and descend a small subtree.
+
+    Any insert or remove on the tree invalidates the finger; the cursor
+    then finds its way back from the root using its last key. If that
+    key was removed, key is None until the cursor moves, and next and
+    prev continue from where the key used to be.
+
+    Attributes:
+        tree: the tree this cursor walks
+        node: the current node, or None if the cursor is off an end
+    """
+    def __init__(self, tree):
+        """
+        Creates a cursor that is not positioned yet.
+
+        Running Time:
+            O(1)
+        """
+        self.tree = tree
+        self.node = None
+        self._key = None
+        # 1 past the last key, -1 before the first key, 0 otherwise
+        # (with no node, 0 means the cursor was never positioned)
+        self._off = 0
+        self._version = tree._version
+
+    @property
+    def key(self):
+        """
+        The key at the cursor, or None if the cursor is off an end
+        or its key was removed.
+
+        Running Time:
+            O(1) when the cursor is valid, O(log(n)) otherwise.
+        """
+        if self.node is None:
+            return None
+        if not self._valid():
+            node = self.tree.root and self.tree.root.find(self._key)
+            if node is None:
+                return None
+            self._move(node)
+        return self._key
+
+    def _valid(self):
+        return self.node is not None and self._version == self.tree._version
+
+    def _move(self, node, off = 0):
+        self.node = node
+        self._version = self.tree._version
+        if node is not None:
+            self._key = node.key
+            self._off = 0
+        else:
+            self._off = off
+        return self.key
+
+    def seek(self, k):
+        """
+        Moves to the first key >= k and returns it (None if there is none).
+
+        When the cursor is valid, the search climbs from the current node
+        only until the subtree around it must contain k, then descends,
+        so nearby keys cost O(log(d)) in a balanced tree, d is the number
+        of keys in between.
+
+        Running Time:
+            O(log(n))
+        """
+        if not self._valid():
+            return self._move(self.tree._lower_bound(k), 1)
+        x = self.node
+        while(True):
+            p = x.parent
+            if k == x.key:
+                # x is the answer unless an equal key comes before it
+                before = x.next_smaller()
+                if before is None or before.key < k:
+                    return self._move(x)
+            if k > x.key:
+                # x.right holds exactly the keys between x and p
+                if p is not None and x is p.left and k < p.key:
+                    return self._move(Cursor._descend(x.right, k, p), 1)
+            else:
+                # x.left holds exactly the keys between p and x
+                if p is not None and x is p.right and k > p.key:
+                    return self._move(Cursor._descend(x.left, k, x), 1)
+            if p is None:
+                return self._move(Cursor._descend(x, k, None), 1)
+            x = p
+
+    @staticmethod
+    def _descend(node, k, candidate):
+        while(node is not None):
+            if node.key >= k:
+                candidate = node
+                node = node.left
+            else:
+                node = node.right
+        return candidate
+
+    def next(self):
+        """
+        Moves to the next larger key and returns it (None at the end).
+
+        From before the first key, or from a cursor that was never
+        positioned, it moves to the first key.
+
+        Running Time:
+            O(1) amortized when the cursor is valid.
+        """
+        if self.node is None:
+            if self._off == 1:
+                return None
+            node = self.tree.root and self.tree.root.find_min()
+        elif not self._valid():
+            node = self.tree._lower_bound(self._key, True)
+        else:
+            node = self.node.next_larger()
+        return self._move(node, 1)
+
+    def prev(self):
+        """
+        Moves to the next smaller key and returns it (None at the start).
+
+        From past the last key, or from a cursor that was never
+        positioned, it moves to the last key.
 
-        
\ No newline at end of file
+        Running Time:
+            O(1) amortized when the cursor is valid.
+        """
+        if self.node is None:
+            if self._off == -1:
+                return None
+            node = self.tree.root and self.tree.root.find_max()
+        elif not self._valid():
+            node = self.tree._floor_node(self._key, True)
+        else:
+            node = self.node.next_smaller()
+        return self._move(node, -1)
@@ -0,0 +1,274 @@
+"""
+    A OrderedMap implementation:
+    A key -> value map kept in key order, built on SizeAVL.
+    Every key appears at most once (assignment updates the value).
+"""
+import operator
+
+from SizeAVL import SizeAVLNode, SizeAVL
+
+# marks a missing default argument, so that None can be a real default
+_missing = object()
+
+
+class MapNode(SizeAVLNode):
+    """A SizeAVLNode which also carries a value."""
+    __slots__ = ('value',)
+
+    def __init__(self, key, parent, value = None):
+        """
+        Creates a node.
+
+        Args:
+            key: key of the node.
+            parent: The node's parent.
+            value: value of the node.
+        """
+        super(MapNode, self).__init__(key, parent)
+        self.value = value
+
+    def _swap_payload(self, other):
+        super(MapNode, self)._swap_payload(other)
+        self.value, other.value = other.value, self.value
+
+
+class OrderedMap(SizeAVL):
+    """
+    An ordered map with a dict-like API.
+
+    Iteration yields the keys in ascending order. len is O(1)
+    because the tree keeps subtree sizes.
+    """
+    def __init__(self, items = None, node_class = MapNode):
+        """
+        Creates a OrderedMap.
+
+        Args:
+            items: Optional (key, value) pairs or a mapping to load.
+
+        Running Time:
+            O(m*log(m)), m is the number of items.
+        """
+        super(OrderedMap, self).__init__(node_class)
+        if items is not None:
+            self.update(items)
+
+    @classmethod
+    def from_sorted(cls, items):
+        """
+        Builds a OrderedMap from (key, value) pairs in non-decreasing
+        key order. The last value of a repeated key wins.
+
+        Running Time:
+            O(n)
+        """
+        tree = cls()
+        tree._load_sorted(tree.node_class(k, None, v) for k, v in OrderedMap._last_of_runs(items))
+        return tree
+
+    @classmethod
+    def from_iterable(cls, items):
+        """
+        Builds a OrderedMap from a mapping or (key, value) pairs in
+        any order. The last value of a repeated key wins, like dict.
+
+        Running Time:
+            O(n*log(n)) for the sort, O(n) if the keys are already sorted.
+        """
+        if hasattr(items, 'items'):
+            items = items.items()
+        # the sort is stable, so equal keys keep their order
+        return cls.from_sorted(sorted(items, key = operator.itemgetter(0)))
+
+    @staticmethod
+    def _last_of_runs(items):
+        # keeps the last pair of every run of equal keys
+        pending = None
+        for item in items:
+            if pending is not None and pending[0] != item[0]:
+                yield pending
+            pending = item
+        if pending is not None:
+            yield pending
+
+    @classmethod
+    def join(cls, left, k, right, value = None):
+        """
+        Joins two maps and a new key k with value in between them.
+
+        Every key in left must be < k and every key in right must be > k.
+        Both maps are emptied; their nodes are moved into the result.
+
+        Running Time:
+            O(log(n))
+        """
+        if((left.root is not None and left.find_max() >= k) or
+           (right.root is not None and right.find_min() <= k)):
+            raise ValueError("keys are not ordered around %r" % (k,))
+        return cls._join_trees(left, left.node_class(k, None, value), right)
+
+    def intersection_update(self, other):
+        # the AVL set operations move the nodes out of another tree,
+        # which is not what a dict-like map does
+        raise TypeError("OrderedMap does not support intersection_update")
+
+    def difference_update(self, other):
+        raise TypeError("OrderedMap does not support difference_update")
+
+    def update(self, items = (), **kwargs):
+        """
+        Sets the value of every key in items (a mapping or (key, value)
+        pairs) and in kwargs, like dict.update. items is left unchanged.
+
+        Running Time:
+            O(m*log(n + m)), m is the number of items.
+        """
+        if hasattr(items, 'items'):
+            items = items.items()
+        for k, v in items:
+            self[k] = v
+        for k, v in kwargs.items():
+            self[k] = v
+
+    def _upsert(self, k):
+        """
+        Finds the node with key k, or inserts one if there is none.
+
+        Returns:
+            (node, created)
+
+        Running Time:
+            O(log(n))
+        """
+        parent = None
+        node = self.root
+        while(node is not None):
+            if k == node.key:
+                return node, False
+            parent = node
+            node = node.left if k < node.key else node.right
+        self._version += 1
+        self._start_operation()
+        node = self.node_class(k, parent)
+        if parent is None:
+            self.root = node
+        elif k < parent.key:
+            parent.left = node
+        else:
+            parent.right = node
+        self._rebalance(node)
+        return node, True
+
+    def _find_node(self, k):
+        return self.root and self.root.find(k)
+
+    def insert(self, k, value = None):
+        """
+        Sets the value of key k, inserting k if it is missing.
+
+        Returns:
+            The node holding k.
+
+        Running Time:
+            O(log(n))
+        """
+        node, _ = self._upsert(k)
+        node.value = value
+        return node
+
+    def __setitem__(self, k, value):
+        self.insert(k, value)
+
+    def __getitem__(self, k):
+        node = self._find_node(k)
+        if node is None:
+            raise KeyError(k)
+        return node.value
+
+    def __delitem__(self, k):
+        node = self._find_node(k)
+        if node is None:
+            raise KeyError(k)
+        self._remove_node(node)
+
+    def __contains__(self, k):
+        return self._find_node(k) is not None
+
+    def get(self, k, default = None):
+        """
+        Returns the value of key k, or default if k is missing.
+
+        Running Time:
+            O(log(n))
+        """
+        node = self._find_node(k)
+        return default if node is None else node.value
+
+    def pop(self, k, default = _missing):
+        """
+        Removes key k and returns its value.
+
+        Raises:
+            KeyError: if k is missing and no default is given.
+
+        Running Time:
+            O(log(n))
+        """
+        node = self._find_node(k)
+        if node is None:
+            if default is _missing:
+                raise KeyError(k)
+            return default
+        # the unlinked node carries the payload of node
+        return self._remove_node(node).value
+
+    def setdefault(self, k, default = None):
+        """
+        Returns the value of key k, inserting k with default if it is missing.
+
+        Running Time:
+            O(log(n))
+        """
+        node, created = self._upsert(k)
+        if created:
+            node.value = default
+        return node.value
+
+    def floor(self, k):
+        """
+        Returns the largest key <= k, or None.
+
+        Running Time:
+            O(log(n))
+        """
+        node = self._floor_node(k)
+        return node and node.key
+
+    def ceiling(self, k):
+        """
+        Returns the smallest key >= k, or None.
+
+        Running Time:
+            O(log(n))
+        """
+        node = self._lower_bound(k)
+        return node and node.key
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        for _, v in self.items():
+            yield v
+
+    def items(self):
+        """
+        Yields the (key, value) pairs in ascending key order.
+
+        Running Time:
+            O(n)
+        """
+        node = self.root and self.root.find_min()
+        while(node is not None):
+            yield node.key, node.value
+            node = node.next_larger()
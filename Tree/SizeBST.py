@@ -4,7 +4,7 @@
     the number of nodes in the subtree rooted at this node
 """
 
-from BST import BSTNode, BST
+from BST import CompactBSTNode, BSTNode, BST
 
 def size(node):
     if node is None:
@@ -12,26 +12,12 @@ def size(node):
     else:
         return node.size
 
-class SizeBSTNode(BSTNode):
+class SizeNodeMixin(object):
     """
-    A BSTNode which is augmented to keep track of 
-    the number of nodes in the subtree rooted at this node.
+    The order statistics of a node that keeps the size of its subtree,
+    shared by SizeBSTNode and SizeAVLNode.
     """
-    def __init__(self, key, parent):
-        """
-        Creates a node.
-        
-        Args:
-            parent: The node's parent.
-            k: key of the node.
-        """
-        super(SizeBSTNode, self).__init__(key, parent)
-        self.size = 1
-
-    def _update_info(self):
-        self.size = 1 + size(self.left) + size(self.right)
-        if(self.parent is not None):
-            self.parent._update_info()
+    __slots__ = ()
 
     def rank(self, k):
         """
@@ -46,47 +32,48 @@ class SizeBSTNode(BSTNode):
         Running Time:
             O(log(n))
         """
-        if k < self.key:
-            if(self.left is None):
-                return 0
+        count = 0
+        node = self
+        while(node is not None):
+            if k < node.key:
+                node = node.left
             else:
-                return self.left.rank(k)
-        else:
-            if self.right is None:  
-                return self.size
-            else:
-                return 1 + size(self.left) + self.right.rank(k)
+                count += 1 + size(node.left)
+                node = node.right
+        return count
 
-    def check_ri(self):
+    def select(self, i):
         """
-        Checks the BST representation invariant around this node.
-    
-        Assert is not true if the RI is violated.
+        Finds the node with the i-th smallest key (0-indexed)
+        from the subtree rooted at this node.
+
+        Args:
+            i: The rank of the node.
+
+        Returns:
+            The node, or None if i is out of range.
 
         Running Time:
-            O(n)
-        """
-        size = 1
-        if self.left is not None:
-            assert(self.left.key <= self.key)
-            assert(self.left.parent is self)
-            size += self.left.size
-            self.left.check_ri()
-        if self.right is not None:
-            assert(self.right.key >= self.key)
-            assert(self.right.parent is self)
-            size += self.right.size
-            self.right.check_ri()
-        assert(self.size == size)
-
-class SizeBST(BST):
+            O(log(n))
+        """
+        node = self
+        while(node is not None):
+            left = size(node.left)
+            if i < left:
+                node = node.left
+            elif i == left:
+                return node
+            else:
+                i -= left + 1
+                node = node.right
+        return None
+
+
+class SizeTreeMixin(object):
     """
-    An augmented BST that keeps track of the node with 
-    the number of nodes in the subtree rooted at this node
+    The order statistics of a tree whose nodes keep the size of their
+    subtrees, shared by SizeBST and SizeAVL.
     """
-    def __init__(self, node_class = SizeBSTNode):
-        super(SizeBST, self).__init__(node_class)
-    
     def rank(self, k):
         """
         Count the number of nodes that key is less than k.
@@ -111,6 +98,125 @@ class SizeBST(BST):
         else:
             return self.root.rank(k2) - self.root.rank(k1)
 
+    def __len__(self):
+        return size(self.root)
+
+    def _select_node(self, i):
+        n = len(self)
+        if i < 0:
+            i += n
+        if i < 0 or i >= n:
+            raise IndexError("rank out of range")
+        return self.root.select(i)
+
+    def select(self, i):
+        """
+        Returns the i-th smallest key (0-indexed, negative i counts from the end).
+
+        Raises:
+            IndexError: if i is out of range.
+
+        Running Time:
+            O(log(n))
+        """
+        return self._select_node(i).key
+
+    def percentile(self, q):
+        """
+        Returns the q-th percentile key by the nearest-rank method.
+
+        Args:
+            q: The percentile, between 0 and 100.
+
+        Raises:
+            IndexError: if the tree is empty.
+
+        Running Time:
+            O(log(n))
+        """
+        if q < 0 or q > 100:
+            raise ValueError("percentile must be between 0 and 100")
+        # nearest rank: the smallest key with at least q% of keys <= it
+        i = -(-q * len(self) // 100) - 1
+        return self.select(max(i, 0))
+
+    def median(self):
+        """
+        Returns the median key (the lower one if the size is even).
+
+        Raises:
+            IndexError: if the tree is empty.
+
+        Running Time:
+            O(log(n))
+        """
+        return self.select((len(self) - 1) // 2)
+
+    def iter_rank_range(self, i, j):
+        """
+        Yields the keys with rank in [i, j) in ascending order.
+
+        Running Time:
+            O(log(n) + j - i)
+        """
+        i, j, _ = slice(i, j).indices(len(self))
+        if i >= j:
+            return
+        node = self.root.select(i)
+        for _ in range(j - i):
+            yield node.key
+            node = node.next_larger()
+
+
+class CompactSizeBSTNode(SizeNodeMixin, CompactBSTNode):
+    """
+    A CompactBSTNode which is augmented to keep track of
+    the number of nodes in the subtree rooted at this node.
+    """
+    __slots__ = ('size',)
+
+    def __init__(self, key, parent):
+        """
+        Creates a node.
+        
+        Args:
+            parent: The node's parent.
+            k: key of the node.
+        """
+        super(CompactSizeBSTNode, self).__init__(key, parent)
+        self.size = 1
+
+    def _update_info(self):
+        node = self
+        while(node is not None):
+            node.size = 1 + size(node.left) + size(node.right)
+            node = node.parent
+
+    def _check_node(self):
+        """
+        Checks the SizeBST representation invariant at this node only.
+
+        Running Time:
+            O(1)
+        """
+        super(CompactSizeBSTNode, self)._check_node()
+        assert(self.size == 1 + size(self.left) + size(self.right))
+
+class SizeBSTNode(CompactSizeBSTNode, BSTNode):
+    """
+    A BSTNode which is augmented to keep track of 
+    the number of nodes in the subtree rooted at this node.
+    """
+
+
+class SizeBST(SizeTreeMixin, BST):
+    """
+    An augmented BST that keeps track of the node with 
+    the number of nodes in the subtree rooted at this node
+    """
+    def __init__(self, node_class = SizeBSTNode):
+        super(SizeBST, self).__init__(node_class)
+    
     def insert(self, k):
         """
         Inserts a node into the SizeBST.
@@ -128,20 +234,14 @@ class SizeBST(BST):
         node._update_info()
         return node
 
-    def remove(self, k):
+    def _remove_node(self, node):
         """
-        Removes and returns the node with key k from the SizeBST.
-
-        Args:
-            k: The key of the node that we want to delete.
-            
-        Returns:
-            The deleted node with key k.
+        Removes node from the SizeBST and fixes the sizes above it.
 
         Running Time:
             O(log(n))
         """
-        node = super(SizeBST, self).remove(k)
+        node = super(SizeBST, self)._remove_node(node)
         node._update_info()
         return node
 
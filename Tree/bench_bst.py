@@ -0,0 +1,78 @@
+"""
+    Benchmark for the iterative BST descent paths:
+    1. per operation latency of find/insert/remove on random keys for
+       BST, AVL and SizeAVL, next to the recursive descent they replaced;
+    2. a degenerate (list-like) tree of n keys, checking that find,
+       find_min, find_max, iteration and check_ri all finish without
+       hitting the recursion limit.
+
+    Usage: python bench_bst.py [n_random] [n_degenerate]
+    The degenerate tree defaults to 10M keys and needs about 1GB of memory.
+"""
+import random
+import sys
+import time
+
+from BST import BST, CompactBSTNode
+from AVL import AVL
+from SizeAVL import SizeAVL
+
+
+def _recursive_find(node, k):
+    # the recursive descent BSTNode.find used before
+    if node is None or k == node.key:
+        return node
+    if k < node.key:
+        return _recursive_find(node.left, k)
+    return _recursive_find(node.right, k)
+
+
+def _per_op(f, keys):
+    start = time.perf_counter()
+    for k in keys:
+        f(k)
+    return (time.perf_counter() - start) / len(keys) * 1e9
+
+
+def latency(n):
+    keys = list(range(n))
+    random.Random(1).shuffle(keys)
+    print("%-8s %12s %12s %12s %16s" % ("tree", "insert ns", "find ns", "remove ns", "rec. find ns"))
+    for tree_class in (BST, AVL, SizeAVL):
+        tree = tree_class()
+        insert = _per_op(tree.insert, keys)
+        find = _per_op(tree.find, keys)
+        recursive = _per_op(lambda k: _recursive_find(tree.root, k), keys)
+        remove = _per_op(tree.remove, keys)
+        print("%-8s %12.0f %12.0f %12.0f %16.0f" % (tree_class.__name__, insert, find,
+                                                    remove, recursive))
+
+
+def degenerate(n):
+    # sorted inserts into a plain BST build a right spine, but take
+    # O(n^2) time, so the spine is linked directly
+    tree = BST(node_class = CompactBSTNode)
+    tree.insert(0)
+    node = tree.root
+    for k in range(1, n):
+        child = CompactBSTNode(k, node)
+        node.right = child
+        node = child
+    start = time.perf_counter()
+    assert tree.find(n - 1).key == n - 1
+    assert tree.find_min() == 0
+    assert tree.find_max() == n - 1
+    assert tree.root.find(n - 1).next_larger() is None
+    tree.insert(n)
+    count = 0
+    for _ in tree:
+        count += 1
+    assert count == n + 1
+    tree.check_ri()
+    tree.remove(n)
+    print("degenerate tree of %d keys: ok in %.1fs" % (n, time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    latency(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
+    degenerate(int(sys.argv[2]) if len(sys.argv) > 2 else 10000000)
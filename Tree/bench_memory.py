@@ -0,0 +1,41 @@
+"""
+    Memory benchmark for the BST family:
+    reports the bytes per key of a tree built with the default node
+    classes and with the compact (slotted) node classes.
+
+    Usage: python bench_memory.py [n]
+"""
+import random
+import sys
+import tracemalloc
+
+from BST import BST, BSTNode, CompactBSTNode
+from AVL import AVL, AVLNode, CompactAVLNode
+from SizeAVL import SizeAVL, SizeAVLNode, CompactSizeAVLNode
+
+
+def bytes_per_key(tree_class, node_class, keys):
+    tracemalloc.start()
+    tree = tree_class(node_class = node_class)
+    for k in keys:
+        tree.insert(k)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return used / len(keys)
+
+
+def main(n):
+    keys = list(range(n))
+    random.Random(1).shuffle(keys)
+    # the keys themselves are allocated up front, so only nodes are counted
+    print("%-8s %-20s %12s" % ("tree", "node class", "bytes/key"))
+    for tree_class, node_classes in ((BST, (BSTNode, CompactBSTNode)),
+                                     (AVL, (AVLNode, CompactAVLNode)),
+                                     (SizeAVL, (SizeAVLNode, CompactSizeAVLNode))):
+        for node_class in node_classes:
+            print("%-8s %-20s %12.1f" % (tree_class.__name__, node_class.__name__,
+                                         bytes_per_key(tree_class, node_class, keys)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,78 @@
+"""
+    Benchmark for OrderedMap against a dict + bisect wrapper
+    (a dict for the values next to a sorted list of the keys)
+    on mixed workloads of set, get, pop and floor operations.
+
+    Usage: python bench_ordered_map.py [n_ops] [key_space]
+"""
+import bisect
+import random
+import sys
+import time
+
+from OrderedMap import OrderedMap
+
+
+class DictBisectMap(object):
+    """The wrapper layer: a dict plus a sorted key list."""
+    def __init__(self):
+        self.values = {}
+        self.keys = []
+
+    def __setitem__(self, k, v):
+        if k not in self.values:
+            bisect.insort(self.keys, k)
+        self.values[k] = v
+
+    def get(self, k, default = None):
+        return self.values.get(k, default)
+
+    def pop(self, k, default = None):
+        if k not in self.values:
+            return default
+        del self.keys[bisect.bisect_left(self.keys, k)]
+        return self.values.pop(k)
+
+    def floor(self, k):
+        i = bisect.bisect_right(self.keys, k)
+        return self.keys[i - 1] if i else None
+
+
+# (set, get, pop, floor) weights
+WORKLOADS = {
+    'read-heavy': (10, 70, 10, 10),
+    'write-heavy': (50, 20, 25, 5),
+    'range-heavy': (20, 20, 10, 50),
+}
+
+
+def make_ops(n, key_space, weights, seed):
+    rng = random.Random(seed)
+    names = rng.choices(('set', 'get', 'pop', 'floor'), weights, k = n)
+    return [(name, rng.randrange(key_space)) for name in names]
+
+
+def run(m, ops):
+    start = time.perf_counter()
+    for name, k in ops:
+        if name == 'set':
+            m[k] = k
+        elif name == 'get':
+            m.get(k)
+        elif name == 'pop':
+            m.pop(k, None)
+        else:
+            m.floor(k)
+    return (time.perf_counter() - start) / len(ops) * 1e9
+
+
+def main(n, key_space):
+    print("%-12s %18s %18s" % ("workload", "OrderedMap ns/op", "dict+bisect ns/op"))
+    for name, weights in WORKLOADS.items():
+        ops = make_ops(n, key_space, weights, 1)
+        print("%-12s %18.0f %18.0f" % (name, run(OrderedMap(), ops), run(DictBisectMap(), ops)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 1000000)